@@ -1,7 +1,52 @@
-from markitdown import MarkItDown
+from docx.opc.part import PartFactory
+from docx.package import Package
+from docx.parts.document import DocumentPart
 
-md = MarkItDown(enable_plugins=False) # Set to True to enable plugins
-result = md.convert("tsinghua_template.dotx")
+# The WML *template* main-part content type (.dotx); its payload is the same
+# WordprocessingML as a .docx, but docx.Document() rejects it outright
+_WML_TEMPLATE_MAIN = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml"
+)
+PartFactory.part_type_for[_WML_TEMPLATE_MAIN] = DocumentPart
 
-with open("converted_markdown.md", "w", encoding="utf-8") as file:
-    file.write(result.text_content)
\ No newline at end of file
+# Heading styles map to markdown prefixes; everything else is a plain paragraph
+heading_prefixes = {f"Heading {i}": "#" * i + " " for i in range(1, 7)}
+
+
+def open_document(path):
+    """Open a .docx or .dotx package.
+
+    docx.Document() rejects template packages by content type, so go
+    through Package directly; the main document part is identical.
+    """
+    return Package.open(path).main_document_part.document
+
+
+def iter_doc_as_markdown(doc):
+    """Yield markdown lines for a docx document one at a time.
+
+    Only the current line is held in memory, so peak RSS stays bounded by
+    the write buffer regardless of document size.
+    """
+    for para in doc.paragraphs:
+        text = para.text
+        if not text.strip():
+            continue
+        prefix = heading_prefixes.get(para.style.name if para.style else "", "")
+        yield prefix + text + "\n\n"
+
+    for table in doc.tables:
+        # Walk the table XML directly to avoid python-docx rebuilding cell proxies
+        for r, tr in enumerate(table._tbl.tr_lst):
+            cells = ["".join(tc.itertext()).strip() for tc in tr.tc_lst]
+            yield "| " + " | ".join(cells) + " |\n"
+            if r == 0:
+                yield "|" + "---|" * len(cells) + "\n"
+        yield "\n"
+
+
+if __name__ == "__main__":
+    doc = open_document("tsinghua_template.dotx")
+    with open("converted_markdown.md", "w", encoding="utf-8", buffering=1 << 20) as fh:
+        for line in iter_doc_as_markdown(doc):
+            fh.write(line)
@@ -1,10 +1,22 @@
 import os
 import sys
-from src.main import TemplateMapper
 
 # 添加根目录路径
 sys.path.append(os.path.dirname(__file__))
 sys_path = os.path.dirname(__file__)
+
+from src.main import TemplateMapper
+
+# 单个TemplateMapper实例处理全部文档，复用解析器和AI客户端
 mapper = TemplateMapper()
 
-output_file = mapper.process(os.path.join(sys_path, "asserts", "comprehensive_document.md"), os.path.join(sys_path, "asserts", "template.docx"), os.path.join(sys_path, "asserts", "output.docx"))
\ No newline at end of file
+jobs = [
+    (
+        os.path.join(sys_path, "asserts", "comprehensive_document.md"),
+        os.path.join(sys_path, "asserts", "template.docx"),
+        os.path.join(sys_path, "asserts", "output.docx"),
+    ),
+]
+
+for markdown_file, template_file, output_file in jobs:
+    mapper.process(markdown_file, template_file, output_file)
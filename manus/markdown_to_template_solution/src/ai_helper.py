@@ -2,127 +2,340 @@
 AI辅助模块，负责调用大模型API进行结构调整
 """
 
+import asyncio
 import logging
 import json
+import time
 from typing import Dict, List, Any, Optional
 
-from .config import AI_MODEL_CONFIG
+from openai import AsyncOpenAI, APIConnectionError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+from .config import AI_MODEL_CONFIG, TEX_HEADING_COMMANDS
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """
+    异步令牌桶限流器，同时约束每分钟请求数（RPM）和每分钟token数（TPM）
+
+    按请求到达时间持续补充两个令牌桶，请求发出前先扣减令牌，
+    余量不足时等待补充，从而把429限流错误转化为平滑的排队调度。
+    """
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        """
+        初始化限流器
+
+        Args:
+            max_requests_per_minute: 每分钟最大请求数
+            max_tokens_per_minute: 每分钟最大token数
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._request_capacity = float(max_requests_per_minute)
+        self._token_capacity = float(max_tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        等待直到两个令牌桶都有足够余量，然后扣减令牌
+
+        Args:
+            estimated_tokens: 本次请求预计消耗的token数
+        """
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._last_refill = now
+
+                # 按流逝时间补充令牌，不超过桶容量
+                self._request_capacity = min(
+                    self.max_requests_per_minute,
+                    self._request_capacity + elapsed * self.max_requests_per_minute / 60.0
+                )
+                self._token_capacity = min(
+                    self.max_tokens_per_minute,
+                    self._token_capacity + elapsed * self.max_tokens_per_minute / 60.0
+                )
+
+                if self._request_capacity >= 1 and self._token_capacity >= estimated_tokens:
+                    self._request_capacity -= 1
+                    self._token_capacity -= estimated_tokens
+                    return
+
+            await asyncio.sleep(0.05)
+
+
 class AIHelper:
     """
     AI辅助类，用于调用大模型API进行内容结构调整
+
+    所有问题修复请求通过AsyncOpenAI客户端并发发出，
+    单个文档的调整耗时约等于一次API调用的延迟。
+
+    调整在原结构上进行：只有被改写的元素替换为新dict，
+    未涉及的元素与容器均按引用共享，不做防御性复制。
     """
-    
+
     def __init__(self):
         """
         初始化AI辅助类
         """
         self.config = AI_MODEL_CONFIG
+        # 客户端/信号量/限流器绑定创建时的事件循环，按循环缓存（见_ensure_client）
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[RateLimiter] = None
         logger.info(f"初始化AI辅助模块，使用模型: {self.config.get('model_name', 'unknown')}")
-    
-    def adjust_structure(self, content: Dict[str, Any], issues: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+
+    async def _ensure_client(self) -> Optional[AsyncOpenAI]:
+        """
+        懒加载AsyncOpenAI客户端，按当前事件循环缓存
+
+        客户端内部复用同一个HTTP连接池，同一循环内的并发请求共享连接；
+        但连接池和信号量都绑定创建时的循环，跨asyncio.run()复用会在
+        旧循环关闭后抛出"Event loop is closed"，因此检测到新循环时
+        连同信号量、限流器一起重建。
+        如果未配置API密钥则返回None，调用方应退回模拟调整。
+
+        Returns:
+            AsyncOpenAI客户端，不可用时返回None
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 新的事件循环：丢弃绑定旧循环的客户端与同步原语
+            self._loop = loop
+            self._client = None
+            self._semaphore = None
+            self._rate_limiter = None
+
+        if self._client is None:
+            try:
+                self._client = AsyncOpenAI()
+            except Exception as e:
+                logger.warning(f"无法创建OpenAI客户端: {str(e)}，将使用模拟调整")
+                return None
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.get('max_concurrency', 10))
+
+        if self._rate_limiter is None:
+            self._rate_limiter = RateLimiter(
+                self.config.get('max_requests_per_minute', 60),
+                self.config.get('max_tokens_per_minute', 90000)
+            )
+
+        return self._client
+
+    async def adjust_structure_async(self, content: Dict[str, Any], issues: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         调用大模型API调整内容结构
-        
+
+        一个文档的全部结构问题合并为一次批量请求发出，
+        响应为与问题列表一一对应的JSON修复数组。
+
         Args:
             content: 需要调整的内容结构
             issues: 结构问题列表
-            
+
         Returns:
             调整后的内容结构，如果调整失败则返回None
         """
         if not issues:
             logger.info("没有需要调整的结构问题")
             return None
-        
+
         logger.info(f"开始调用大模型API调整结构，共有 {len(issues)} 个问题")
-        
+
         try:
-            # 在实际应用中，这里应该调用真实的大模型API
-            # 本demo中使用模拟调用
-            adjusted_content = self._simulate_ai_adjustment(content, issues)
-            
+            client = await self._ensure_client()
+            if client is None:
+                # 没有可用的API客户端，使用模拟调整
+                adjusted_content = self._simulate_ai_adjustment(content, issues)
+            else:
+                prompt = self._build_batch_prompt(issues)
+                response = await self._call_openai_async(prompt)
+                adjusted_content = self._apply_batch_response(content, issues, response)
+
             logger.info("结构调整完成")
             return adjusted_content
-            
+
         except Exception as e:
             logger.error(f"调用大模型API时出错: {str(e)}", exc_info=True)
             return None
-    
+
+    def _build_batch_prompt(self, issues: List[Dict[str, Any]]) -> str:
+        """
+        将全部结构问题合并为一个批量提示文本
+
+        Args:
+            issues: 结构问题列表
+
+        Returns:
+            提示文本
+        """
+        lines = []
+        for i, issue in enumerate(issues):
+            issue_type = issue.get('type', '')
+            level = issue.get('level', 1)
+            text = issue.get('text', '')
+
+            if issue_type == 'missing_heading_style':
+                hint = f"模板中没有 {level} 级标题的样式，需给出style字段"
+            else:
+                hint = f"模板中没有 {level} 级标题的LaTeX命令，需给出command字段"
+
+            lines.append(f"{i + 1}. 标题 \"{text}\"（级别 {level}）：{hint}")
+
+        issue_list = '\n'.join(lines)
+        return (
+            f"以下文档标题存在结构问题：\n{issue_list}\n"
+            f"请按编号顺序给出每个问题的修复值，以JSON数组返回，"
+            f"数组中每项为一个对象，例如 [{{\"style\": \"...\"}}, {{\"command\": \"...\"}}]，"
+            f"不要输出其他内容。"
+        )
+
+    def _apply_batch_response(self, content: Dict[str, Any], issues: List[Dict[str, Any]], response: str) -> Dict[str, Any]:
+        """
+        将批量API响应中的修复结果应用到内容结构
+
+        Args:
+            content: 需要调整的内容结构
+            issues: 结构问题列表
+            response: 批量API响应文本，应为与issues等长的JSON数组
+
+        Returns:
+            调整后的内容结构
+        """
+        try:
+            patches = json.loads(response)
+            if not isinstance(patches, list):
+                raise ValueError("响应不是JSON数组")
+        except (ValueError, json.JSONDecodeError):
+            logger.warning("无法解析批量API响应，退回默认修复: %s", response[:50])
+            return self._simulate_ai_adjustment(content, issues)
+
+        # 直接在原结构上打补丁，只为被修改的元素构造新dict，
+        # 不复制容器本身
+        elements = content.get('elements', [])
+
+        # 预先建立标题索引，每个问题的元素查找为O(1)
+        heading_index = self._build_heading_index(elements)
+
+        # 缺少对应修复项或格式错误的问题退回默认规则修复
+        fallback_issues = []
+
+        for i, issue in enumerate(issues):
+            patch = patches[i] if i < len(patches) else None
+            if not isinstance(patch, dict):
+                fallback_issues.append(issue)
+                continue
+
+            level = issue.get('level', 1)
+            text = issue.get('text', '')
+
+            j = heading_index.get((level, text))
+            if j is None:
+                continue
+
+            fixes = {key: patch[key] for key in ('style', 'command') if key in patch}
+            if fixes:
+                # 替换为新dict而非原地改写，持有旧元素引用的下游不受影响
+                elements[j] = {**elements[j], **fixes}
+                logger.info("调整了标题: %s -> %s", text, fixes)
+
+        if fallback_issues:
+            return self._simulate_ai_adjustment(content, fallback_issues)
+
+        return content
+
     def _simulate_ai_adjustment(self, content: Dict[str, Any], issues: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         模拟大模型API调用进行结构调整
-        
+
         Args:
             content: 需要调整的内容结构
             issues: 结构问题列表
-            
+
         Returns:
             调整后的内容结构
         """
-        # 创建调整后的内容副本
-        adjusted_content = content.copy()
-        elements = adjusted_content.get('elements', []).copy()
-        
+        # 直接在原结构上打补丁，只为被修改的元素构造新dict，
+        # 不复制容器本身
+        elements = content.get('elements', [])
+
+        # 预先建立标题索引，每个问题的元素查找为O(1)而非遍历全部元素
+        heading_index = self._build_heading_index(elements)
+
         # 处理每个问题
         for issue in issues:
             issue_type = issue.get('type', '')
-            
+            level = issue.get('level', 1)
+            text = issue.get('text', '')
+
+            # 查找对应的元素
+            i = heading_index.get((level, text))
+            if i is None:
+                continue
+
             if issue_type == 'missing_heading_style':
-                # 处理缺失标题样式问题
-                level = issue.get('level', 1)
-                text = issue.get('text', '')
-                
-                # 查找对应的元素
-                for i, element in enumerate(elements):
-                    if (element.get('type') == 'heading' and 
-                        element.get('level') == level and 
-                        element.get('text') == text):
-                        # 调整样式
-                        elements[i]['style'] = f"Heading {level}"
-                        logger.info(f"调整了标题样式: {text} -> Heading {level}")
-                        break
-            
+                # 调整样式，替换为新dict而非原地改写
+                elements[i] = {**elements[i], 'style': f"Heading {level}"}
+                logger.info("调整了标题样式: %s -> Heading %s", text, level)
+
             elif issue_type == 'missing_heading_command':
-                # 处理缺失标题命令问题
-                level = issue.get('level', 1)
-                text = issue.get('text', '')
-                
-                # 查找对应的元素
-                for i, element in enumerate(elements):
-                    if (element.get('type') == 'heading' and 
-                        element.get('level') == level and 
-                        element.get('text') == text):
-                        # 调整命令
-                        level_to_command = {
-                            1: '\\section',
-                            2: '\\subsection',
-                            3: '\\subsubsection',
-                            4: '\\paragraph',
-                            5: '\\subparagraph',
-                            6: '\\subparagraph'
-                        }
-                        elements[i]['command'] = level_to_command.get(level, '\\section')
-                        logger.info(f"调整了标题命令: {text} -> {elements[i]['command']}")
-                        break
-        
-        adjusted_content['elements'] = elements
-        return adjusted_content
-    
-    def _call_openai_api(self, prompt: str) -> str:
-        """
-        调用OpenAI API
-        
+                # 调整命令
+                command = TEX_HEADING_COMMANDS.get(level, '\\section')
+                elements[i] = {**elements[i], 'command': command}
+                logger.info("调整了标题命令: %s -> %s", text, command)
+
+        return content
+
+    @staticmethod
+    def _build_heading_index(elements: List[Dict[str, Any]]) -> Dict[Any, int]:
+        """
+        为标题元素建立(级别, 文本) -> 下标的索引
+
+        Args:
+            elements: 内容元素列表
+
+        Returns:
+            标题索引字典
+        """
+        index = {}
+        for i, element in enumerate(elements):
+            if element.get('type') == 'heading':
+                index[(element.get('level'), element.get('text'))] = i
+        return index
+
+    @retry(stop=stop_after_attempt(3),
+           wait=wait_random_exponential(min=1, max=30),
+           retry=retry_if_exception_type((RateLimitError, APIConnectionError, asyncio.TimeoutError)))
+    async def _call_openai_async(self, prompt: str) -> str:
+        """
+        异步调用OpenAI API，受信号量和令牌桶限流器约束
+
+        遇到限流或连接错误时按指数退避重试，最多尝试3次。
+
         Args:
             prompt: 提示文本
-            
+
         Returns:
             API响应文本
         """
-        # 实际应用中，这里应该调用真实的OpenAI API
-        # 本demo中仅作为示例
-        logger.info(f"模拟调用OpenAI API，提示长度: {len(prompt)}")
-        return "模拟的API响应"
+        async with self._semaphore:
+            # 按提示长度粗估输入token数，加上生成上限作为预算
+            estimated_tokens = len(prompt) // 4 + self.config.get('max_tokens', 1000)
+            await self._rate_limiter.acquire(estimated_tokens=estimated_tokens)
+            response = await self._client.chat.completions.create(
+                model=self.config.get('model_name', 'gpt-4'),
+                messages=[{'role': 'user', 'content': prompt}],
+                temperature=self.config.get('temperature', 0.3),
+                max_tokens=self.config.get('max_tokens', 1000),
+            )
+            return response.choices[0].message.content or ''
@@ -14,6 +14,9 @@ AI_MODEL_CONFIG = {
     'model_name': 'gpt-4',  # 使用的模型名称
     'temperature': 0.3,     # 生成文本的随机性
     'max_tokens': 1000,     # 最大生成token数
+    'max_concurrency': 10,  # 并发API请求数上限
+    'max_requests_per_minute': 60,     # 每分钟最大请求数（RPM限流）
+    'max_tokens_per_minute': 90000,    # 每分钟最大token数（TPM限流）
 }
 
 # Markdown元素到模板样式的默认映射
@@ -48,6 +51,28 @@ DEFAULT_STYLE_MAPPING = {
     }
 }
 
+# 标题级别到docx样式名的映射，预先生成避免每个标题拼f-string
+DOCX_HEADING_STYLES = {level: f'Heading {level}' for level in range(1, 7)}
+
+# 标题级别到LaTeX命令的映射，模块级常量避免每次调用重建
+TEX_HEADING_COMMANDS = {
+    1: '\\section',
+    2: '\\subsection',
+    3: '\\subsubsection',
+    4: '\\paragraph',
+    5: '\\subparagraph',
+    6: '\\subparagraph',
+}
+
+# 标题级别到LaTeX命令名称（不含反斜杠）的映射
+TEX_HEADING_COMMAND_NAMES = {
+    1: 'section',
+    2: 'subsection',
+    3: 'subsubsection',
+    4: 'paragraph',
+    5: 'subparagraph',
+}
+
 # 样式冲突解决策略
 STYLE_CONFLICT_RESOLUTION = {
     'priority': 'template',  # 'template' 或 'content'，决定冲突时优先使用哪方的样式
@@ -56,7 +81,7 @@ STYLE_CONFLICT_RESOLUTION = {
 
 # 日志配置
 LOG_CONFIG = {
-    'level': 'INFO',  # 日志级别: DEBUG, INFO, WARNING, ERROR, CRITICAL
+    'level': 'WARNING',  # 日志级别: DEBUG, INFO, WARNING, ERROR, CRITICAL；默认WARNING避免热循环逐元素记日志
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     'file': 'template_mapper.log',
 }
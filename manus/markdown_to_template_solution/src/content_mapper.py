@@ -5,12 +5,22 @@
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 
+from .config import DEFAULT_STYLE_MAPPING, TEX_HEADING_COMMANDS, TEX_HEADING_COMMAND_NAMES
+
 logger = logging.getLogger(__name__)
 
+# 映射时复用的默认样式表，导入时求值一次
+_DOCX_STYLES = DEFAULT_STYLE_MAPPING['docx']
+_TEX_STYLES = DEFAULT_STYLE_MAPPING['tex']
+
 
 class ContentMapper:
     """
     内容映射器，将Markdown内容结构映射到模板结构
+
+    约定：map()返回的结构可能与输入共享元素引用（见_map_generic），
+    调用方不得原地修改返回的结构；需要改写元素时应替换为新对象，
+    参考AIHelper的补丁策略。
     """
     
     def __init__(self):
@@ -47,6 +57,66 @@ class ContentMapper:
         logger.info(f"内容映射完成，发现 {len(self.structure_issues)} 个结构问题")
         return mapped_content
     
+    def iter_map(self, content_elements, template_structure: Dict[str, Any]):
+        """
+        逐元素映射内容，惰性生成映射结果
+
+        与map()等价的流式接口：不物化中间列表，配合StyleMapper.iter_apply
+        可以把整条映射管线的峰值内存压到单个元素级别。
+        结构问题列表在迭代完全消费后才完整。
+
+        Args:
+            content_elements: 内容元素的可迭代对象
+            template_structure: 模板的结构化表示
+
+        Yields:
+            映射后的元素
+        """
+        # 重置问题列表
+        self.structure_issues = []
+
+        template_type = template_structure.get('type', '')
+
+        if template_type == 'docx':
+            template_elements = template_structure.get('structure', [])
+            heading_styles, paragraph_style = self._extract_template_styles(template_elements)
+            for element in content_elements:
+                mapped = self._map_one_docx(element, heading_styles, paragraph_style)
+                if mapped is not None:
+                    yield mapped
+        elif template_type == 'tex':
+            template_styles = template_structure.get('styles', {})
+            for element in content_elements:
+                mapped = self._map_one_tex(element, template_styles)
+                if mapped is not None:
+                    yield mapped
+        else:
+            logger.warning(f"未知的模板类型: {template_type}，元素原样透传")
+            yield from content_elements
+
+    def build_envelope(self, template_structure: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        构建映射结果的外层结构（不含elements）
+
+        Args:
+            template_structure: 模板的结构化表示
+
+        Returns:
+            含映射元信息的外层dict
+        """
+        template_type = template_structure.get('type', '')
+        envelope = {
+            'type': 'mapped_content',
+            'template_type': template_type if template_type else 'generic'
+        }
+
+        if template_type == 'tex':
+            # 保存文档类和包信息
+            envelope['document_class'] = template_structure.get('document_class', {})
+            envelope['packages'] = template_structure.get('packages', [])
+
+        return envelope
+
     def has_structure_issues(self) -> bool:
         """
         检查是否存在结构匹配问题
@@ -87,96 +157,118 @@ class ContentMapper:
         template_styles = template_structure.get('styles', {})
         template_elements = template_structure.get('structure', [])
         
-        # 分析模板结构，找出标题层级和段落样式
-        heading_styles = self._extract_heading_styles(template_elements)
-        paragraph_style = self._extract_default_paragraph_style(template_elements)
-        
-        # 处理内容元素
+        # 分析模板结构，单次遍历同时找出标题层级和段落样式
+        heading_styles, paragraph_style = self._extract_template_styles(template_elements)
+
+        # 处理内容元素，通过列表推导式一次性构建结果列表
         content_elements = content_structure.get('elements', [])
-        
-        for element in content_elements:
-            element_type = element.get('type', '')
-            
-            if element_type == 'heading':
-                # 映射标题
-                level = element.get('level', 1)
-                style_name = self._get_heading_style_for_level(level, heading_styles)
-                
-                if not style_name:
-                    # 记录问题：模板中没有对应级别的标题样式
-                    self.structure_issues.append({
-                        'type': 'missing_heading_style',
-                        'level': level,
-                        'text': element.get('text', '')
-                    })
-                    style_name = f"Heading {level}"  # 使用默认样式
-                
-                mapped_element = {
-                    'type': 'heading',
-                    'level': level,
-                    'text': element.get('text', ''),
-                    'style': style_name
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'paragraph':
-                # 映射段落
-                mapped_element = {
-                    'type': 'paragraph',
-                    'text': element.get('text', ''),
-                    'style': paragraph_style
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'list' or element_type == 'list_item':
-                # 映射列表
-                list_type = element.get('list_type', 'unordered')
-                mapped_element = {
-                    'type': 'list_item',
-                    'text': element.get('text', ''),
-                    'list_type': list_type,
-                    'style': 'List Paragraph'
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'code_block':
-                # 映射代码块
-                mapped_element = {
-                    'type': 'code_block',
-                    'text': element.get('text', ''),
-                    'style': 'Code'
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'block_quote':
-                # 映射引用块
-                mapped_element = {
-                    'type': 'block_quote',
-                    'text': element.get('text', ''),
-                    'style': 'Quote'
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'table':
-                # 映射表格
-                mapped_element = {
-                    'type': 'table',
-                    'rows': element.get('rows', []),
-                    'style': 'Table Normal'
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'image':
-                # 映射图片
-                mapped_element = {
-                    'type': 'image',
-                    'src': element.get('src', ''),
-                    'alt': element.get('alt', ''),
-                    'caption_style': 'Caption'
-                }
-                mapped_content['elements'].append(mapped_element)
-        
+        mapped_content['elements'] = [
+            m for e in content_elements
+            if (m := self._map_one_docx(e, heading_styles, paragraph_style)) is not None
+        ]
+
         return mapped_content
+
+    def _map_one_docx(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Optional[Dict[str, Any]]:
+        """
+        映射单个元素到docx样式
+
+        Args:
+            element: 内容元素
+            heading_styles: 标题样式映射
+            paragraph_style: 默认段落样式
+
+        Returns:
+            映射后的元素，无对应处理函数时返回None
+        """
+        handler = self._DOCX_ELEMENT_HANDLERS.get(element.type)
+        if handler is None:
+            return None
+        return handler(self, element, heading_styles, paragraph_style)
+
+    def _map_docx_heading(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射标题元素到docx样式"""
+        level = element.level
+        style_name = self._get_heading_style_for_level(level, heading_styles)
+
+        if not style_name:
+            # 记录问题：模板中没有对应级别的标题样式
+            self.structure_issues.append({
+                'type': 'missing_heading_style',
+                'level': level,
+                'text': element.text
+            })
+            # 使用默认样式
+            style_name = _DOCX_STYLES.get(f'heading_{level}', f"Heading {level}")
+
+        return {
+            'type': 'heading',
+            'level': level,
+            'text': element.text,
+            'style': style_name
+        }
+
+    def _map_docx_paragraph(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射段落元素到docx样式"""
+        return {
+            'type': 'paragraph',
+            'text': element.text,
+            'style': paragraph_style
+        }
+
+    def _map_docx_list_item(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射列表元素到docx样式"""
+        return {
+            'type': 'list_item',
+            'text': getattr(element, 'text', ''),
+            'list_type': getattr(element, 'list_type', 'unordered'),
+            'style': _DOCX_STYLES['list_item']
+        }
+
+    def _map_docx_code_block(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射代码块元素到docx样式"""
+        return {
+            'type': 'code_block',
+            'text': element.text,
+            'style': _DOCX_STYLES['code_block']
+        }
+
+    def _map_docx_block_quote(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射引用块元素到docx样式"""
+        return {
+            'type': 'block_quote',
+            'text': element.text,
+            'style': _DOCX_STYLES['block_quote']
+        }
+
+    def _map_docx_table(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射表格元素到docx样式"""
+        return {
+            'type': 'table',
+            'rows': getattr(element, 'rows', []),
+            'style': _DOCX_STYLES['table']
+        }
+
+    def _map_docx_image(self, element: Any, heading_styles: Dict[int, str], paragraph_style: str) -> Dict[str, Any]:
+        """映射图片元素到docx样式"""
+        return {
+            'type': 'image',
+            'src': element.src,
+            'alt': element.alt,
+            'caption_style': _DOCX_STYLES['image_caption']
+        }
+
+    # 元素类型 -> docx映射处理函数的分发表，构建一次后O(1)查找
+    _DOCX_ELEMENT_HANDLERS = {
+        'heading': _map_docx_heading,
+        'paragraph': _map_docx_paragraph,
+        'list': _map_docx_list_item,
+        'list_item': _map_docx_list_item,
+        'code_block': _map_docx_code_block,
+        'block_quote': _map_docx_block_quote,
+        'table': _map_docx_table,
+        'image': _map_docx_image,
+    }
     
     def _map_to_tex(self, content_structure: Dict[str, Any], template_structure: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -205,93 +297,115 @@ class ContentMapper:
         mapped_content['document_class'] = document_class
         mapped_content['packages'] = packages
         
-        # 处理内容元素
+        # 处理内容元素，通过列表推导式一次性构建结果列表
         content_elements = content_structure.get('elements', [])
-        
-        for element in content_elements:
-            element_type = element.get('type', '')
-            
-            if element_type == 'heading':
-                # 映射标题
-                level = element.get('level', 1)
-                command = self._get_tex_heading_command(level, template_styles)
-                
-                if not command:
-                    # 记录问题：模板中没有对应级别的标题命令
-                    self.structure_issues.append({
-                        'type': 'missing_heading_command',
-                        'level': level,
-                        'text': element.get('text', '')
-                    })
-                    command = self._get_default_tex_heading_command(level)
-                
-                mapped_element = {
-                    'type': 'heading',
-                    'level': level,
-                    'text': element.get('text', ''),
-                    'command': command
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'paragraph':
-                # 映射段落
-                mapped_element = {
-                    'type': 'paragraph',
-                    'text': element.get('text', '')
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'list' or element_type == 'list_item':
-                # 映射列表
-                list_type = element.get('list_type', 'unordered')
-                env_type = 'itemize' if list_type == 'unordered' else 'enumerate'
-                
-                mapped_element = {
-                    'type': 'environment',
-                    'env_type': env_type,
-                    'items': [element.get('text', '')]
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'code_block':
-                # 映射代码块
-                mapped_element = {
-                    'type': 'environment',
-                    'env_type': 'verbatim',
-                    'content': element.get('text', '')
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'block_quote':
-                # 映射引用块
-                mapped_element = {
-                    'type': 'environment',
-                    'env_type': 'quote',
-                    'content': element.get('text', '')
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'table':
-                # 映射表格
-                mapped_element = {
-                    'type': 'environment',
-                    'env_type': 'tabular',
-                    'content': element.get('content', '')
-                }
-                mapped_content['elements'].append(mapped_element)
-                
-            elif element_type == 'image':
-                # 映射图片
-                mapped_element = {
-                    'type': 'command',
-                    'name': 'includegraphics',
-                    'options': [],
-                    'arguments': [element.get('src', '')],
-                    'caption': element.get('alt', '')
-                }
-                mapped_content['elements'].append(mapped_element)
-        
+        mapped_content['elements'] = [
+            m for e in content_elements
+            if (m := self._map_one_tex(e, template_styles)) is not None
+        ]
+
         return mapped_content
+
+    def _map_one_tex(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        映射单个元素到tex样式
+
+        Args:
+            element: 内容元素
+            template_styles: 模板样式定义
+
+        Returns:
+            映射后的元素，无对应处理函数时返回None
+        """
+        handler = self._TEX_ELEMENT_HANDLERS.get(element.type)
+        if handler is None:
+            return None
+        return handler(self, element, template_styles)
+
+    def _map_tex_heading(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射标题元素到LaTeX命令"""
+        level = element.level
+        command = self._get_tex_heading_command(level, template_styles)
+
+        if not command:
+            # 记录问题：模板中没有对应级别的标题命令
+            self.structure_issues.append({
+                'type': 'missing_heading_command',
+                'level': level,
+                'text': element.text
+            })
+            command = self._get_default_tex_heading_command(level)
+
+        return {
+            'type': 'heading',
+            'level': level,
+            'text': element.text,
+            'command': command
+        }
+
+    def _map_tex_paragraph(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射段落元素，LaTeX段落不需要特殊命令"""
+        return {
+            'type': 'paragraph',
+            'text': element.text
+        }
+
+    def _map_tex_list_item(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射列表元素到LaTeX环境"""
+        list_type = getattr(element, 'list_type', 'unordered')
+        env_type = _TEX_STYLES['list_item'] if list_type == 'unordered' else 'enumerate'
+
+        return {
+            'type': 'environment',
+            'env_type': env_type,
+            'items': [getattr(element, 'text', '')]
+        }
+
+    def _map_tex_code_block(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射代码块元素到LaTeX环境"""
+        return {
+            'type': 'environment',
+            'env_type': _TEX_STYLES['code_block'],
+            'content': element.text
+        }
+
+    def _map_tex_block_quote(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射引用块元素到LaTeX环境"""
+        return {
+            'type': 'environment',
+            'env_type': _TEX_STYLES['block_quote'],
+            'content': element.text
+        }
+
+    def _map_tex_table(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射表格元素到LaTeX环境"""
+        return {
+            'type': 'environment',
+            'env_type': _TEX_STYLES['table'],
+            'content': getattr(element, 'content', '')
+        }
+
+    def _map_tex_image(self, element: Any, template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """映射图片元素到LaTeX命令"""
+        return {
+            'type': 'command',
+            'name': 'includegraphics',
+            'options': [],
+            'arguments': [element.src],
+            'caption': element.alt
+        }
+
+    # 元素类型 -> tex映射处理函数的分发表，构建一次后O(1)查找
+    _TEX_ELEMENT_HANDLERS = {
+        'heading': _map_tex_heading,
+        'paragraph': _map_tex_paragraph,
+        'list': _map_tex_list_item,
+        'list_item': _map_tex_list_item,
+        'code_block': _map_tex_code_block,
+        'block_quote': _map_tex_block_quote,
+        'table': _map_tex_table,
+        'image': _map_tex_image,
+    }
     
     def _map_generic(self, content_structure: Dict[str, Any], template_structure: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -304,49 +418,41 @@ class ContentMapper:
         Returns:
             映射后的内容结构
         """
-        # 简单地复制内容结构，添加映射标记
-        mapped_content = content_structure.copy()
-        mapped_content['type'] = 'mapped_content'
-        mapped_content['template_type'] = 'generic'
-        
-        return mapped_content
+        # 只构建下游实际消费的键，元素列表按引用共享而不复制
+        return {
+            'type': 'mapped_content',
+            'template_type': 'generic',
+            'elements': content_structure.get('elements', [])
+        }
     
-    def _extract_heading_styles(self, template_elements: List[Dict[str, Any]]) -> Dict[int, str]:
+    def _extract_template_styles(self, template_elements: List[Dict[str, Any]]) -> Tuple[Dict[int, str], str]:
         """
-        从模板元素中提取标题样式
-        
+        从模板元素中提取标题样式和默认段落样式
+
+        两类信息在同一次遍历中收集，避免对模板元素列表走两遍。
+
         Args:
             template_elements: 模板元素列表
-            
+
         Returns:
-            标题级别到样式名称的映射
+            (标题级别到样式名称的映射, 默认段落样式名称)
         """
-        heading_styles = {}
-        
+        heading_styles: Dict[int, str] = {}
+        paragraph_style = None
+
         for element in template_elements:
-            if element.get('type') == 'heading':
+            element_type = element.get('type')
+
+            if element_type == 'heading':
                 level = element.get('level', 1)
-                style = element.get('style', f"Heading {level}")
-                heading_styles[level] = style
-        
-        return heading_styles
-    
-    def _extract_default_paragraph_style(self, template_elements: List[Dict[str, Any]]) -> str:
-        """
-        从模板元素中提取默认段落样式
-        
-        Args:
-            template_elements: 模板元素列表
-            
-        Returns:
-            默认段落样式名称
-        """
-        for element in template_elements:
-            if element.get('type') == 'paragraph':
-                return element.get('style', 'Normal')
-        
-        return 'Normal'  # 默认样式
-    
+                heading_styles[level] = element.get('style', f"Heading {level}")
+            elif element_type == 'paragraph' and paragraph_style is None:
+                # 第一个段落的样式作为默认段落样式
+                paragraph_style = element.get('style', 'Normal')
+
+        return heading_styles, paragraph_style if paragraph_style is not None else 'Normal'
+
+
     def _get_heading_style_for_level(self, level: int, heading_styles: Dict[int, str]) -> Optional[str]:
         """
         获取指定级别标题的样式
@@ -371,15 +477,7 @@ class ContentMapper:
         Returns:
             LaTeX命令，如果没有找到则返回None
         """
-        level_to_command = {
-            1: 'section',
-            2: 'subsection',
-            3: 'subsubsection',
-            4: 'paragraph',
-            5: 'subparagraph'
-        }
-        
-        command_name = level_to_command.get(level)
+        command_name = TEX_HEADING_COMMAND_NAMES.get(level)
         if not command_name:
             return None
         
@@ -399,13 +497,4 @@ class ContentMapper:
         Returns:
             默认的LaTeX命令
         """
-        level_to_command = {
-            1: '\\section',
-            2: '\\subsection',
-            3: '\\subsubsection',
-            4: '\\paragraph',
-            5: '\\subparagraph',
-            6: '\\subparagraph'
-        }
-        
-        return level_to_command.get(level, '\\section')
+        return TEX_HEADING_COMMANDS.get(level, '\\section')
@@ -0,0 +1,128 @@
+"""
+内容元素数据类定义，解析结果使用带__slots__的紧凑对象而非逐元素dict
+"""
+
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, List
+
+
+class _ElementBase:
+    """
+    所有内容元素数据类的公共基类
+
+    子类通过类属性type标识元素类型，映射阶段据此分发。
+    __slots__为空元组，保证子类实例不携带__dict__。
+    type字符串经sys.intern驻留，作为dict键分发时哈希/比较更快。
+    """
+    __slots__ = ()
+
+    type: ClassVar[str] = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为dict表示，供JSON序列化等遗留路径使用"""
+        result: Dict[str, Any] = {'type': self.type}
+        for f in fields(self):
+            result[f.name] = getattr(self, f.name)
+        return result
+
+
+@dataclass(slots=True)
+class HeadingElement(_ElementBase):
+    """标题元素"""
+    type: ClassVar[str] = sys.intern('heading')
+
+    level: int
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ParagraphElement(_ElementBase):
+    """段落元素"""
+    type: ClassVar[str] = sys.intern('paragraph')
+
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ListElement(_ElementBase):
+    """列表元素"""
+    type: ClassVar[str] = sys.intern('list')
+
+    list_type: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ListItemElement(_ElementBase):
+    """列表项元素"""
+    type: ClassVar[str] = sys.intern('list_item')
+
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class CodeBlockElement(_ElementBase):
+    """代码块元素"""
+    type: ClassVar[str] = sys.intern('code_block')
+
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class BlockQuoteElement(_ElementBase):
+    """引用块元素"""
+    type: ClassVar[str] = sys.intern('block_quote')
+
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TableElement(_ElementBase):
+    """表格元素"""
+    type: ClassVar[str] = sys.intern('table')
+
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TableRowElement(_ElementBase):
+    """表格行元素"""
+    type: ClassVar[str] = sys.intern('table_row')
+
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TableCellElement(_ElementBase):
+    """表格单元格元素"""
+    type: ClassVar[str] = sys.intern('table_cell')
+
+    cell_type: str
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ImageElement(_ElementBase):
+    """图片元素"""
+    type: ClassVar[str] = sys.intern('image')
+
+    src: str
+    alt: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    path: List[int] = field(default_factory=list)
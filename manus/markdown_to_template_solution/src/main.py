@@ -3,8 +3,11 @@
 """
 
 import os
+import asyncio
+import hashlib
 import logging
 import argparse
+from collections import OrderedDict
 from typing import Dict, Any
 
 from .config import LOG_CONFIG, SUPPORTED_TEMPLATE_FORMATS, SUPPORTED_OUTPUT_FORMATS
@@ -23,15 +26,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 模块级共享实例，跨process()调用复用，避免每次构造解析器和AI客户端
+_markdown_parser = MarkdownParser()
+_ai_helper = AIHelper()
+
 
 class TemplateMapper:
     """
     主类，负责协调各模块完成从Markdown到模板的映射过程
     """
-    
+
+    # Markdown解析缓存的最大条目数
+    _MARKDOWN_CACHE_SIZE = 128
+
     def __init__(self):
-        self.markdown_parser = MarkdownParser()
-        self.ai_helper = AIHelper()
+        self.markdown_parser = _markdown_parser
+        self.ai_helper = _ai_helper
+        # 内容哈希 -> 解析结果的LRU缓存，批量/预览场景下相同输入跳过解析
+        self._markdown_cache: OrderedDict = OrderedDict()
         
     def process(self, markdown_file: str, template_file: str, output_file: str = None) -> str:
         """
@@ -59,28 +71,32 @@ class TemplateMapper:
         # 解析Markdown文件
         logger.info(f"解析Markdown文件: {markdown_file}")
         markdown_content = self._read_file(markdown_file)
-        content_structure = self.markdown_parser.parse(markdown_content)
+        content_structure = self._parse_markdown_cached(markdown_content)
         
         # 解析模板文件
         logger.info(f"解析模板文件: {template_file}")
-        template_parser = TemplateParserFactory.create_parser(template_format)
-        template_structure = template_parser.parse(template_file)
+        template_structure = self._parse_template_cached(template_file, template_format)
         
-        # 内容映射
-        logger.info("执行内容映射")
+        # 内容映射与样式映射：逐元素流式串联，只物化最终的样式化列表
+        logger.info("执行内容映射与样式映射")
         content_mapper = ContentMapper()
-        mapped_content = content_mapper.map(content_structure, template_structure)
-        
-        # 样式映射
-        logger.info("执行样式映射")
         style_mapper = StyleMapper(template_format)
-        styled_content = style_mapper.apply_styles(mapped_content, template_structure)
+
+        mapped_stream = content_mapper.iter_map(
+            content_structure.get('elements', []), template_structure
+        )
+        styled_stream = style_mapper.iter_apply(mapped_stream, template_structure)
+
+        styled_content = content_mapper.build_envelope(template_structure)
+        styled_content['elements'] = list(styled_stream)
         
         # 检查结构匹配问题
         if content_mapper.has_structure_issues():
             logger.info("检测到结构匹配问题，尝试使用AI辅助调整")
             issues = content_mapper.get_structure_issues()
-            adjusted_content = self.ai_helper.adjust_structure(styled_content, issues)
+            adjusted_content = asyncio.run(
+                self.ai_helper.adjust_structure_async(styled_content, issues)
+            )
             if adjusted_content:
                 styled_content = adjusted_content
         
@@ -92,19 +108,80 @@ class TemplateMapper:
         logger.info(f"处理完成: {output_file}")
         return output_file
     
+    def _parse_markdown_cached(self, markdown_content: str) -> Dict[str, Any]:
+        """
+        按内容哈希缓存Markdown解析结果
+
+        相同内容的重复解析直接命中缓存，缓存按LRU策略淘汰最久未用条目。
+
+        Args:
+            markdown_content: Markdown文本内容
+
+        Returns:
+            结构化的文档表示
+        """
+        key = hashlib.blake2b(markdown_content.encode('utf-8'), digest_size=16).hexdigest()
+
+        cached = self._markdown_cache.get(key)
+        if cached is not None:
+            self._markdown_cache.move_to_end(key)
+            logger.info("命中Markdown解析缓存，跳过解析")
+            return cached
+
+        content_structure = self.markdown_parser.parse(markdown_content)
+
+        self._markdown_cache[key] = content_structure
+        if len(self._markdown_cache) > self._MARKDOWN_CACHE_SIZE:
+            self._markdown_cache.popitem(last=False)
+
+        return content_structure
+
+    def _parse_template_cached(self, template_file: str, template_format: str) -> Dict[str, Any]:
+        """
+        解析模板文件
+
+        缓存由TemplateParserFactory.parse_template按(路径, mtime_ns, 大小)
+        统一维护，所有调用方共享同一份缓存。
+
+        Args:
+            template_file: 模板文件路径
+            template_format: 模板格式类型
+
+        Returns:
+            结构化的模板表示
+        """
+        return TemplateParserFactory.parse_template(template_file, template_format)
+
     def _read_file(self, file_path: str) -> str:
-        """读取文件内容"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        """读取文件内容，二进制整读后解码，大缓冲区减少系统调用"""
+        with open(file_path, 'rb', buffering=1 << 20) as f:
+            return f.read().decode('utf-8')
+
+    def _read_file_mmap(self, file_path: str):
+        """
+        以内存映射方式打开文件，供超大输入的零拷贝扫描使用
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            只读的mmap对象，调用方负责关闭
+        """
+        import mmap
+
+        with open(file_path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     
     def _get_file_extension(self, file_path: str) -> str:
-        """获取文件扩展名"""
-        return os.path.splitext(file_path)[1].lstrip('.').lower()
-    
+        """获取文件扩展名：只在basename内取最后一个点，目录名中的点不参与"""
+        head, _, ext = os.path.basename(file_path).rpartition('.')
+        return ext.lower() if head else ''
+
     def _generate_output_filename(self, input_file: str, output_format: str) -> str:
-        """生成输出文件名"""
-        base_name = os.path.splitext(input_file)[0]
-        return f"{base_name}_output.{output_format}"
+        """生成输出文件名，扩展名剥离同样只作用于basename"""
+        directory, name = os.path.split(input_file)
+        base = name.rpartition('.')[0] or name
+        return os.path.join(directory, f"{base}_output.{output_format}")
 
 
 def main():
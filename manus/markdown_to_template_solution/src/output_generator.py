@@ -3,16 +3,49 @@
 """
 
 import os
+import re
 import logging
+import functools
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
-import docx
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Pt, Inches
+from .config import DOCX_HEADING_STYLES, TEX_HEADING_COMMANDS
+
+if TYPE_CHECKING:
+    import docx
 
 logger = logging.getLogger(__name__)
 
+# python-docx按需导入：仅生成docx输出时才加载，tex-only流程不付导入成本
+docx = None
+WD_ALIGN_PARAGRAPH = None
+qn = None
+OxmlElement = None
+
+# 列表项缩进，单位为二十分之一磅（0.25英寸 = 360 twips）
+_LIST_INDENT_TWIPS = '360'
+
+
+def _ensure_docx():
+    """首次需要时导入python-docx"""
+    global docx, WD_ALIGN_PARAGRAPH, qn, OxmlElement
+    if docx is None:
+        import docx as _docx
+        from docx.enum.text import WD_ALIGN_PARAGRAPH as _wd_align
+        from docx.oxml import OxmlElement as _oxml_element
+        from docx.oxml.ns import qn as _qn
+
+        docx = _docx
+        WD_ALIGN_PARAGRAPH = _wd_align
+        qn = _qn
+        OxmlElement = _oxml_element
+
+# 文档环境正则：贪婪匹配首个\begin{document}到最后一个\end{document}，一次扫描定位
+_DOC_ENV_RE = re.compile(r'\\begin\{document\}.*\\end\{document\}', re.DOTALL)
+
+_BEGIN_DOCUMENT_LEN = len('\\begin{document}')
+_END_DOCUMENT_LEN = len('\\end{document}')
+
 
 class OutputGenerator(ABC):
     """
@@ -35,126 +68,197 @@ class OutputGenerator(ABC):
 class DocxOutputGenerator(OutputGenerator):
     """
     .docx格式输出生成器
+
+    正文元素先在树外构建为OXML节点并缓存到列表，最后一次性挂到
+    文档body上，避免python-docx逐段append时的Python层开销；
+    样式名到样式ID的解析结果按名称缓存，跳过python-docx内部的
+    线性查找。
     """
-    
+
     def generate(self, styled_content: Dict[str, Any], template_structure: Dict[str, Any], output_file: str) -> None:
         """
         生成.docx输出文档
-        
+
         Args:
             styled_content: 应用样式后的内容结构
             template_structure: 模板结构
             output_file: 输出文件路径
         """
         logger.info(f"开始生成.docx输出文档: {output_file}")
-        
+
+        _ensure_docx()
+
         try:
             # 使用模板创建新文档
             template_path = template_structure.get('path', '')
             if os.path.exists(template_path):
                 doc = docx.Document(template_path)
-                # 清除模板中的内容，但保留样式
-                for i in range(len(doc.paragraphs)-1, -1, -1):
-                    p = doc.paragraphs[i]
-                    p._element.getparent().remove(p._element)
+                # 批量清除模板正文，保留样式和节属性(sectPr)
+                body = doc.element.body
+                sect_pr = body.find(qn('w:sectPr'))
+                for child in list(body):
+                    if child is not sect_pr:
+                        body.remove(child)
             else:
                 logger.warning(f"模板文件不存在: {template_path}，使用空白文档")
                 doc = docx.Document()
-            
-            # 处理每个内容元素
-            elements = styled_content.get('elements', [])
-            for element in elements:
-                self._add_element_to_doc(doc, element)
-            
+
+            # 每次生成重建样式ID缓存，绑定到当前文档的样式表
+            self._style_ids: Dict[str, str] = {}
+
+            # 按元素类型分发，OXML节点先缓冲再批量挂树
+            handlers = self._ADD_HANDLERS
+            pending: List[Any] = []
+            for element in styled_content.get('elements', []):
+                handler = handlers.get(element.get('type'))
+                if handler is not None:
+                    handler(self, doc, pending, element)
+
+            self._flush_pending(doc, pending)
+
             # 保存文档
             doc.save(output_file)
             logger.info(f".docx输出文档生成完成: {output_file}")
-            
+
         except Exception as e:
             logger.error(f"生成.docx输出文档时出错: {str(e)}", exc_info=True)
             raise
-    
-    def _add_element_to_doc(self, doc: docx.Document, element: Dict[str, Any]) -> None:
-        """
-        将元素添加到文档中
-        
-        Args:
-            doc: docx文档对象
-            element: 内容元素
-        """
-        element_type = element.get('type', '')
-        
-        if element_type == 'heading':
-            # 添加标题
-            level = element.get('level', 1)
-            text = element.get('text', '')
-            style = element.get('style', f'Heading {level}')
-            
-            paragraph = doc.add_paragraph(text, style=style)
-            
-        elif element_type == 'paragraph':
-            # 添加段落
-            text = element.get('text', '')
-            style = element.get('style', 'Normal')
-            
-            paragraph = doc.add_paragraph(text, style=style)
-            
-        elif element_type == 'list_item':
-            # 添加列表项
-            text = element.get('text', '')
-            style = element.get('style', 'List Paragraph')
-            list_type = element.get('list_type', 'unordered')
-            
-            paragraph = doc.add_paragraph(text, style=style)
-            paragraph.style = style
-            
-            # 设置列表格式
-            if list_type == 'unordered':
-                paragraph.style.paragraph_format.left_indent = Inches(0.25)
-                paragraph.style.paragraph_format.first_line_indent = Inches(-0.25)
-            else:
-                paragraph.style.paragraph_format.left_indent = Inches(0.25)
-                paragraph.style.paragraph_format.first_line_indent = Inches(-0.25)
-            
-        elif element_type == 'code_block':
-            # 添加代码块
-            text = element.get('text', '')
-            style = element.get('style', 'Code')
-            
-            paragraph = doc.add_paragraph(text, style=style)
-            
-        elif element_type == 'block_quote':
-            # 添加引用块
-            text = element.get('text', '')
-            style = element.get('style', 'Quote')
-            
-            paragraph = doc.add_paragraph(text, style=style)
-            
-        elif element_type == 'table':
-            # 添加表格
-            rows = element.get('rows', [])
-            # 简化处理，实际应用中需要更复杂的表格处理逻辑
-            table = doc.add_table(rows=1, cols=1)
-            table.style = element.get('style', 'Table Normal')
-            
-        elif element_type == 'image':
-            # 添加图片
-            src = element.get('src', '')
-            alt = element.get('alt', '')
-            
-            # 简化处理，实际应用中需要处理图片路径和插入逻辑
+
+    def _flush_pending(self, doc: 'docx.Document', pending: List[Any]) -> None:
+        """把缓冲的OXML节点批量挂到body上，保持sectPr位于末尾"""
+        if not pending:
+            return
+
+        body = doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        if sect_pr is not None:
+            for node in pending:
+                sect_pr.addprevious(node)
+        else:
+            for node in pending:
+                body.append(node)
+        pending.clear()
+
+    def _style_id(self, doc: 'docx.Document', style_name: str) -> str:
+        """解析样式名对应的样式ID，结果按名称缓存"""
+        style_id = self._style_ids.get(style_name)
+        if style_id is None:
+            try:
+                style_id = doc.styles[style_name].style_id
+            except KeyError:
+                # 模板中没有该样式，退化为按命名约定推导的ID
+                style_id = style_name.replace(' ', '')
+            self._style_ids[style_name] = style_id
+        return style_id
+
+    def _build_paragraph(self, doc: 'docx.Document', text: str, style_name: str = None,
+                         list_indent: bool = False, center: bool = False):
+        """在树外构建一个<w:p>节点"""
+        p = OxmlElement('w:p')
+
+        if style_name or list_indent or center:
+            p_pr = OxmlElement('w:pPr')
+            if style_name:
+                p_style = OxmlElement('w:pStyle')
+                p_style.set(qn('w:val'), self._style_id(doc, style_name))
+                p_pr.append(p_style)
+            if center:
+                jc = OxmlElement('w:jc')
+                jc.set(qn('w:val'), 'center')
+                p_pr.append(jc)
+            if list_indent:
+                ind = OxmlElement('w:ind')
+                ind.set(qn('w:left'), _LIST_INDENT_TWIPS)
+                ind.set(qn('w:hanging'), _LIST_INDENT_TWIPS)
+                p_pr.append(ind)
+            p.append(p_pr)
+
+        if text:
+            r = OxmlElement('w:r')
+            t = OxmlElement('w:t')
+            t.set(qn('xml:space'), 'preserve')
+            t.text = text
+            r.append(t)
+            p.append(r)
+
+        return p
+
+    def _add_heading(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加标题"""
+        level = element.get('level', 1)
+        style = element.get('style', DOCX_HEADING_STYLES.get(level, 'Heading 1'))
+        pending.append(self._build_paragraph(doc, element.get('text', ''), style))
+
+    def _add_paragraph(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加段落"""
+        pending.append(self._build_paragraph(doc, element.get('text', ''), element.get('style', 'Normal')))
+
+    def _add_list_item(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加列表项，缩进写在段落自身的格式上，不改写共享的样式对象"""
+        pending.append(self._build_paragraph(
+            doc, element.get('text', ''), element.get('style', 'List Paragraph'), list_indent=True
+        ))
+
+    def _add_code_block(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加代码块"""
+        pending.append(self._build_paragraph(doc, element.get('text', ''), element.get('style', 'Code')))
+
+    def _add_block_quote(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加引用块"""
+        pending.append(self._build_paragraph(doc, element.get('text', ''), element.get('style', 'Quote')))
+
+    def _add_table(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加表格（简化处理，实际应用中需要更复杂的表格处理逻辑）"""
+        tbl = OxmlElement('w:tbl')
+
+        tbl_pr = OxmlElement('w:tblPr')
+        tbl_style = OxmlElement('w:tblStyle')
+        tbl_style.set(qn('w:val'), self._style_id(doc, element.get('style', 'Table Normal')))
+        tbl_pr.append(tbl_style)
+        tbl.append(tbl_pr)
+
+        tbl.append(OxmlElement('w:tblGrid'))
+
+        tr = OxmlElement('w:tr')
+        tc = OxmlElement('w:tc')
+        tc.append(OxmlElement('w:p'))
+        tr.append(tc)
+        tbl.append(tr)
+
+        pending.append(tbl)
+
+    def _add_image(self, doc: 'docx.Document', pending: List[Any], element: Dict[str, Any]) -> None:
+        """添加图片（简化处理，实际应用中需要处理图片路径和插入逻辑）"""
+        src = element.get('src', '')
+        alt = element.get('alt', '')
+
+        # 如果有图片路径且文件存在，则添加图片
+        if src and os.path.exists(src):
+            # 图片插入依赖python-docx的关系表管理，先落盘缓冲保持元素顺序
+            self._flush_pending(doc, pending)
+
             paragraph = doc.add_paragraph()
             paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # 如果有图片路径且文件存在，则添加图片
-            if src and os.path.exists(src):
-                run = paragraph.add_run()
-                run.add_picture(src)
-                
-                # 添加图片说明
-                if alt:
-                    caption = doc.add_paragraph(alt, style=element.get('caption_style', 'Caption'))
-                    caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            run = paragraph.add_run()
+            run.add_picture(src)
+
+            # 添加图片说明
+            if alt:
+                caption = doc.add_paragraph(alt, style=element.get('caption_style', 'Caption'))
+                caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        else:
+            pending.append(self._build_paragraph(doc, '', center=True))
+
+    # 元素类型 -> 添加方法的分发表，调用方式为handler(self, doc, pending, element)
+    _ADD_HANDLERS = {
+        'heading': _add_heading,
+        'paragraph': _add_paragraph,
+        'list_item': _add_list_item,
+        'code_block': _add_code_block,
+        'block_quote': _add_block_quote,
+        'table': _add_table,
+        'image': _add_image,
+    }
 
 
 class TexOutputGenerator(OutputGenerator):
@@ -181,29 +285,24 @@ class TexOutputGenerator(OutputGenerator):
                 with open(template_path, 'r', encoding='utf-8') as f:
                     template_content = f.read()
             
-            # 提取文档前导部分和后续部分
-            preamble, document_env = self._extract_tex_parts(template_content)
-            
+            # 提取文档前导部分和文档环境，插入位置随之一并返回，不再重复扫描
+            preamble, document_env, content_start, content_end = self._extract_tex_parts(template_content)
+
             # 生成内容部分
             content = self._generate_content(styled_content)
-            
+
             # 组合最终文档
             if document_env:
                 # 使用模板的文档环境
-                begin_pos = document_env.find('\\begin{document}') + len('\\begin{document}')
-                end_pos = document_env.rfind('\\end{document}')
-                
-                if begin_pos >= 0 and end_pos >= 0:
-                    output_content = document_env[:begin_pos] + '\n\n' + content + '\n\n' + document_env[end_pos:]
-                else:
-                    output_content = preamble + '\n\\begin{document}\n\n' + content + '\n\n\\end{document}\n'
+                output_content = document_env[:content_start] + '\n\n' + content + '\n\n' + document_env[content_end:]
             else:
                 # 创建新的文档环境
                 output_content = preamble + '\n\\begin{document}\n\n' + content + '\n\n\\end{document}\n'
             
-            # 保存文档
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output_content)
+            # 保存文档：预先编码后二进制单次写出，跳过文本层的换行翻译与缓冲拷贝
+            data = output_content.encode('utf-8')
+            with open(output_file, 'wb', buffering=0) as f:
+                f.write(data)
             
             logger.info(f".tex输出文档生成完成: {output_file}")
             
@@ -214,101 +313,110 @@ class TexOutputGenerator(OutputGenerator):
     def _extract_tex_parts(self, template_content: str) -> tuple:
         """
         从模板内容中提取前导部分和文档环境
-        
+
+        单次正则扫描定位文档环境，并一并返回内容插入区间，
+        调用方无需再次查找\\begin{document}/\\end{document}。
+
         Args:
             template_content: 模板内容
-            
+
         Returns:
-            前导部分和文档环境
+            (前导部分, 文档环境, 内容起始位置, 内容结束位置)，
+            位置相对于文档环境字符串；未找到环境时后三项为('', -1, -1)
         """
-        # 查找文档环境
-        begin_pos = template_content.find('\\begin{document}')
-        end_pos = template_content.rfind('\\end{document}') + len('\\end{document}')
-        
-        if begin_pos >= 0 and end_pos >= 0:
-            preamble = template_content[:begin_pos]
-            document_env = template_content[begin_pos:end_pos]
-            return preamble, document_env
-        else:
-            # 没有找到文档环境，返回整个内容作为前导部分
-            return template_content, ''
+        match = _DOC_ENV_RE.search(template_content)
+        if match:
+            preamble = template_content[:match.start()]
+            document_env = match.group()
+            return (
+                preamble,
+                document_env,
+                _BEGIN_DOCUMENT_LEN,
+                len(document_env) - _END_DOCUMENT_LEN,
+            )
+
+        # 没有找到文档环境，返回整个内容作为前导部分
+        return template_content, '', -1, -1
     
     def _generate_content(self, styled_content: Dict[str, Any]) -> str:
         """
         生成LaTeX内容
-        
+
         Args:
             styled_content: 应用样式后的内容结构
-            
+
         Returns:
             LaTeX内容文本
         """
+        handlers = self._EMIT_HANDLERS
         content_lines = []
-        
-        # 处理每个内容元素
-        elements = styled_content.get('elements', [])
-        for element in elements:
-            element_type = element.get('type', '')
-            
-            if element_type == 'heading':
-                # 添加标题
-                level = element.get('level', 1)
-                text = element.get('text', '')
-                command = element.get('command', self._get_default_tex_heading_command(level))
-                
-                content_lines.append(f"{command}{{{text}}}")
-                
-            elif element_type == 'paragraph':
-                # 添加段落
-                text = element.get('text', '')
-                content_lines.append(text)
-                content_lines.append('')  # 空行分隔段落
-                
-            elif element_type == 'environment':
-                # 添加环境
-                env_type = element.get('env_type', '')
-                content = element.get('content', '')
-                begin_def = element.get('begin_def', f'\\begin{{{env_type}}}')
-                end_def = element.get('end_def', f'\\end{{{env_type}}}')
-                
-                content_lines.append(begin_def)
-                
-                if env_type in ['itemize', 'enumerate'] and 'items' in element:
-                    # 处理列表项
-                    for item in element.get('items', []):
-                        content_lines.append(f"\\item {item}")
-                else:
-                    # 处理其他环境内容
-                    content_lines.append(content)
-                
-                content_lines.append(end_def)
-                
-            elif element_type == 'command':
-                # 添加命令
-                name = element.get('name', '')
-                options = element.get('options', [])
-                arguments = element.get('arguments', [])
-                
-                command = f"\\{name}"
-                
-                # 添加选项
-                if options:
-                    options_str = ','.join(options)
-                    command += f"[{options_str}]"
-                
-                # 添加参数
-                for arg in arguments:
-                    command += f"{{{arg}}}"
-                
-                content_lines.append(command)
-                
-                # 处理图片说明
-                if name == 'includegraphics' and 'caption' in element:
-                    caption = element.get('caption', '')
-                    if caption:
-                        content_lines.append(f"\\caption{{{caption}}}")
-        
+        extend = content_lines.extend
+
+        # 按元素类型分发到对应的行生成器
+        for element in styled_content.get('elements', []):
+            handler = handlers.get(element.get('type'))
+            if handler is not None:
+                extend(handler(self, element))
+
         return '\n'.join(content_lines)
+
+    def _emit_heading(self, element: Dict[str, Any]):
+        """生成标题对应的行"""
+        level = element.get('level', 1)
+        text = element.get('text', '')
+        command = element.get('command', self._get_default_tex_heading_command(level))
+        return (f"{command}{{{text}}}",)
+
+    def _emit_paragraph(self, element: Dict[str, Any]):
+        """生成段落对应的行，末尾空行分隔段落"""
+        return (element.get('text', ''), '')
+
+    def _emit_environment(self, element: Dict[str, Any]):
+        """生成环境对应的行"""
+        env_type = element.get('env_type', '')
+        lines = [element.get('begin_def', f'\\begin{{{env_type}}}')]
+
+        if env_type in ('itemize', 'enumerate') and 'items' in element:
+            # 处理列表项
+            lines.extend(f"\\item {item}" for item in element.get('items', []))
+        else:
+            # 处理其他环境内容
+            lines.append(element.get('content', ''))
+
+        lines.append(element.get('end_def', f'\\end{{{env_type}}}'))
+        return lines
+
+    def _emit_command(self, element: Dict[str, Any]):
+        """生成命令对应的行"""
+        name = element.get('name', '')
+        options = element.get('options', [])
+        arguments = element.get('arguments', [])
+
+        command = f"\\{name}"
+
+        # 添加选项
+        if options:
+            command += f"[{','.join(options)}]"
+
+        # 添加参数
+        for arg in arguments:
+            command += f"{{{arg}}}"
+
+        lines = [command]
+
+        # 处理图片说明
+        if name == 'includegraphics' and (caption := element.get('caption', '')):
+            lines.append(f"\\caption{{{caption}}}")
+
+        return lines
+
+    # 元素类型 -> 行生成器的分发表，调用方式为handler(self, element)
+    _EMIT_HANDLERS = {
+        'heading': _emit_heading,
+        'paragraph': _emit_paragraph,
+        'environment': _emit_environment,
+        'command': _emit_command,
+    }
     
     def _get_default_tex_heading_command(self, level: int) -> str:
         """
@@ -320,16 +428,7 @@ class TexOutputGenerator(OutputGenerator):
         Returns:
             默认的LaTeX命令
         """
-        level_to_command = {
-            1: '\\section',
-            2: '\\subsection',
-            3: '\\subsubsection',
-            4: '\\paragraph',
-            5: '\\subparagraph',
-            6: '\\subparagraph'
-        }
-        
-        return level_to_command.get(level, '\\section')
+        return TEX_HEADING_COMMANDS.get(level, '\\section')
 
 
 class OutputGeneratorFactory:
@@ -338,13 +437,16 @@ class OutputGeneratorFactory:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def create_generator(format_type: str) -> OutputGenerator:
         """
         创建输出生成器
-        
+
+        生成器不在调用间保留状态，按格式类型缓存实例并跨调用复用。
+
         Args:
             format_type: 输出格式类型
-            
+
         Returns:
             对应格式的输出生成器
         """
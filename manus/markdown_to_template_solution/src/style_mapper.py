@@ -5,10 +5,26 @@
 import logging
 from typing import Dict, List, Any, Optional
 
-from .config import DEFAULT_STYLE_MAPPING, STYLE_CONFLICT_RESOLUTION
+from .config import (
+    DEFAULT_STYLE_MAPPING,
+    DOCX_HEADING_STYLES,
+    STYLE_CONFLICT_RESOLUTION,
+    TEX_HEADING_COMMANDS,
+)
 
 logger = logging.getLogger(__name__)
 
+# 元素类型 -> 默认docx样式名，模块级常量避免每个元素重建dict
+_DOCX_TYPE_TO_STYLE = {
+    'heading': 'Heading 1',  # 标题默认一级，具体级别由模板样式决定
+    'paragraph': 'Normal',
+    'list_item': 'List Paragraph',
+    'code_block': 'Code',
+    'block_quote': 'Quote',
+    'table': 'Table Normal',
+    'image': 'Normal',
+}
+
 
 class StyleMapper:
     """
@@ -29,116 +45,139 @@ class StyleMapper:
     def apply_styles(self, mapped_content: Dict[str, Any], template_structure: Dict[str, Any]) -> Dict[str, Any]:
         """
         应用样式到映射后的内容
-        
+
+        注意：就地改写mapped_content及其元素，不做逐元素复制；
+        调用方如需保留映射结果原件应自行深拷贝。
+
         Args:
             mapped_content: 映射后的内容结构
             template_structure: 模板结构
-            
+
         Returns:
-            应用样式后的内容结构
+            应用样式后的内容结构（与mapped_content为同一对象）
         """
         logger.info(f"开始应用{self.template_format}格式的样式")
-        
+
         # 获取模板样式
         template_styles = template_structure.get('styles', {})
-        
-        # 创建样式应用结果
-        styled_content = mapped_content.copy()
-        
-        # 处理每个元素
-        elements = styled_content.get('elements', [])
-        for i, element in enumerate(elements):
-            element_type = element.get('type', '')
-            
-            if self.template_format == 'docx':
-                elements[i] = self._apply_docx_style(element, template_styles)
-            elif self.template_format == 'tex':
-                elements[i] = self._apply_tex_style(element, template_styles)
-            else:
-                logger.warning(f"未知的模板格式: {self.template_format}，跳过样式应用")
-        
-        styled_content['elements'] = elements
+
+        # 格式在整个循环中不变，分发一次后就地处理每个元素
+        handler = self._format_handler()
+        if handler is None:
+            logger.warning(f"未知的模板格式: {self.template_format}，跳过样式应用")
+            return mapped_content
+
+        for element in mapped_content.get('elements', []):
+            handler(element, template_styles)
+
         logger.info("样式应用完成")
-        return styled_content
+        return mapped_content
     
+    def iter_apply(self, elements, template_structure: Dict[str, Any]):
+        """
+        逐元素应用样式，惰性生成结果
+
+        与apply_styles()等价的流式接口，配合ContentMapper.iter_map使用时
+        整条管线一次只在内存中保留一个元素。
+
+        Args:
+            elements: 映射后元素的可迭代对象
+            template_structure: 模板结构
+
+        Yields:
+            应用样式后的元素
+        """
+        template_styles = template_structure.get('styles', {})
+
+        handler = self._format_handler()
+        if handler is None:
+            logger.warning(f"未知的模板格式: {self.template_format}，跳过样式应用")
+            yield from elements
+            return
+
+        for element in elements:
+            yield handler(element, template_styles)
+
+    def _format_handler(self):
+        """返回当前模板格式对应的样式处理方法，未知格式返回None"""
+        if self.template_format == 'docx':
+            return self._apply_docx_style
+        if self.template_format == 'tex':
+            return self._apply_tex_style
+        return None
+
     def _apply_docx_style(self, element: Dict[str, Any], template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
-        应用docx样式到元素
-        
+        应用docx样式到元素（就地改写）
+
         Args:
             element: 内容元素
             template_styles: 模板样式定义
-            
+
         Returns:
-            应用样式后的元素
+            应用样式后的元素（与传入元素为同一对象）
         """
         element_type = element.get('type', '')
-        
-        # 根据元素类型获取默认样式名称
-        default_style_name = self._get_default_docx_style(element_type)
-        
+
+        # 根据元素类型获取默认样式名称，标题按级别取预生成的样式名
+        if element_type == 'heading':
+            default_style_name = DOCX_HEADING_STYLES.get(element.get('level', 1), 'Heading 1')
+        else:
+            default_style_name = self._get_default_docx_style(element_type)
+
         # 获取元素当前样式
         current_style_name = element.get('style', default_style_name)
-        
+
         # 检查模板中是否有对应样式
-        if current_style_name in template_styles:
+        template_style = template_styles.get(current_style_name)
+        if template_style is not None:
             # 使用模板中的样式
-            template_style = template_styles[current_style_name]
-            
-            # 应用样式属性
-            styled_element = element.copy()
-            styled_element['style'] = current_style_name
-            styled_element['style_properties'] = template_style
-            
-            return styled_element
+            element['style'] = current_style_name
+            element['style_properties'] = template_style
         else:
             # 模板中没有对应样式，使用默认样式
             logger.warning(f"模板中未找到样式: {current_style_name}，使用默认样式: {default_style_name}")
-            
-            styled_element = element.copy()
-            styled_element['style'] = default_style_name
-            
-            return styled_element
+            element['style'] = default_style_name
+
+        return element
     
     def _apply_tex_style(self, element: Dict[str, Any], template_styles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
-        应用tex样式到元素
-        
+        应用tex样式到元素（就地改写）
+
         Args:
             element: 内容元素
             template_styles: 模板样式定义
-            
+
         Returns:
-            应用样式后的元素
+            应用样式后的元素（与传入元素为同一对象）
         """
         element_type = element.get('type', '')
-        
-        styled_element = element.copy()
-        
+
         if element_type == 'heading':
             # 处理标题
             level = element.get('level', 1)
             command = element.get('command', self._get_default_tex_heading_command(level))
-            
+
             # 检查模板中是否有对应命令的样式
             command_name = command.lstrip('\\').split('{')[0]
-            if command_name in template_styles:
+            template_style = template_styles.get(command_name)
+            if template_style is not None:
                 # 使用模板中的样式
-                template_style = template_styles[command_name]
-                styled_element['command'] = template_style.get('definition', command)
-            
+                element['command'] = template_style.get('definition', command)
+
         elif element_type == 'environment':
             # 处理环境
             env_type = element.get('env_type', '')
-            
+
             # 检查模板中是否有对应环境的样式
-            if env_type in template_styles:
+            template_style = template_styles.get(env_type)
+            if template_style is not None:
                 # 使用模板中的样式
-                template_style = template_styles[env_type]
-                styled_element['begin_def'] = template_style.get('begin_def', f'\\begin{{{env_type}}}')
-                styled_element['end_def'] = template_style.get('end_def', f'\\end{{{env_type}}}')
-        
-        return styled_element
+                element['begin_def'] = template_style.get('begin_def', f'\\begin{{{env_type}}}')
+                element['end_def'] = template_style.get('end_def', f'\\end{{{env_type}}}')
+
+        return element
     
     def _get_default_docx_style(self, element_type: str) -> str:
         """
@@ -150,22 +189,7 @@ class StyleMapper:
         Returns:
             默认样式名称
         """
-        # 将元素类型映射到样式名称
-        type_to_style = {
-            'heading': 'Heading',  # 会根据级别进一步处理
-            'paragraph': 'Normal',
-            'list_item': 'List Paragraph',
-            'code_block': 'Code',
-            'block_quote': 'Quote',
-            'table': 'Table Normal',
-            'image': 'Normal'
-        }
-        
-        if element_type == 'heading':
-            # 标题需要特殊处理，因为有级别
-            return 'Heading 1'  # 默认一级标题
-        
-        return type_to_style.get(element_type, 'Normal')
+        return _DOCX_TYPE_TO_STYLE.get(element_type, 'Normal')
     
     def _get_default_tex_heading_command(self, level: int) -> str:
         """
@@ -177,13 +201,4 @@ class StyleMapper:
         Returns:
             默认的LaTeX命令
         """
-        level_to_command = {
-            1: '\\section',
-            2: '\\subsection',
-            3: '\\subsubsection',
-            4: '\\paragraph',
-            5: '\\subparagraph',
-            6: '\\subparagraph'
-        }
-        
-        return level_to_command.get(level, '\\section')
+        return TEX_HEADING_COMMANDS.get(level, '\\section')
@@ -3,17 +3,168 @@
 """
 
 import os
+import functools
 import logging
+import zipfile
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 import docx
-from docx.document import Document as DocxDocument
-from docx.styles.style import _ParagraphStyle
+from docx.oxml.ns import nsmap, qn
+from docx.shared import Pt, Twips
+from docx.styles import BabelFish
+from lxml import etree
 import re
 import xml.etree.ElementTree as ET
 
 logger = logging.getLogger(__name__)
 
+# docx样式表遍历用的限定名，模块级算好避免每个样式重复qn()拆分
+_W_STYLE_TAG = qn('w:style')
+_W_TYPE_ATTR = qn('w:type')
+_W_STYLE_ID_ATTR = qn('w:styleId')
+_W_NAME_TAG = qn('w:name')
+_W_VAL_ATTR = qn('w:val')
+_W_BASED_ON_TAG = qn('w:basedOn')
+
+# 字体属性（w:rPr下）
+_W_RPR_TAG = qn('w:rPr')
+_W_RFONTS_TAG = qn('w:rFonts')
+_W_ASCII_ATTR = qn('w:ascii')
+_W_SZ_TAG = qn('w:sz')
+_W_B_TAG = qn('w:b')
+_W_I_TAG = qn('w:i')
+
+# 段落属性（w:pPr下）
+_W_PPR_TAG = qn('w:pPr')
+_W_JC_TAG = qn('w:jc')
+_W_SPACING_TAG = qn('w:spacing')
+_W_BEFORE_ATTR = qn('w:before')
+_W_AFTER_ATTR = qn('w:after')
+_W_LINE_ATTR = qn('w:line')
+_W_LINE_RULE_ATTR = qn('w:lineRule')
+_W_IND_TAG = qn('w:ind')
+_W_FIRST_LINE_ATTR = qn('w:firstLine')
+_W_HANGING_ATTR = qn('w:hanging')
+
+# 正文结构遍历用的限定名
+_W_BODY_TAG = qn('w:body')
+_W_P_TAG = qn('w:p')
+_W_T_TAG = qn('w:t')
+_W_PSTYLE_TAG = qn('w:pStyle')
+_W_TBL_TAG = qn('w:tbl')
+_W_TR_TAG = qn('w:tr')
+_W_TC_TAG = qn('w:tc')
+_W_TBLGRID_TAG = qn('w:tblGrid')
+_W_GRIDCOL_TAG = qn('w:gridCol')
+
+# 页面设置（w:sectPr下），数值单位为twips
+_W_PGSZ_TAG = qn('w:pgSz')
+_W_PGMAR_TAG = qn('w:pgMar')
+_W_W_ATTR = qn('w:w')
+_W_H_ATTR = qn('w:h')
+_W_LEFT_ATTR = qn('w:left')
+_W_RIGHT_ATTR = qn('w:right')
+_W_TOP_ATTR = qn('w:top')
+_W_BOTTOM_ATTR = qn('w:bottom')
+_W_HEADER_ATTR = qn('w:header')
+_W_FOOTER_ATTR = qn('w:footer')
+
+# docx包内需要解析的部件路径
+_STYLES_PART = 'word/styles.xml'
+_DOCUMENT_PART = 'word/document.xml'
+
+# 预编译的XPath表达式：编译一次、反复求值，
+# 省去每次find()重新解析路径字符串的开销
+_W_NSMAP = {'w': nsmap['w']}
+_XP_CELL_PSTYLE = etree.XPath('.//w:pPr/w:pStyle/@w:val', namespaces=_W_NSMAP)
+_XP_ANY_SECTPR = etree.XPath('.//w:sectPr', namespaces=_W_NSMAP)
+
+
+def _on_off(element) -> bool:
+    """解析w:b/w:i这类开关元素：存在即为真，除非val显式为假"""
+    if element is None:
+        return False
+    return element.get(_W_VAL_ATTR) not in ('0', 'false', 'off')
+
+# tex模板解析相关的正则与常量，模块级预编译避免每次解析重新构建
+_HEADING_COMMANDS = ('section', 'subsection', 'subsubsection', 'paragraph', 'subparagraph')
+_ENVIRONMENTS = ('itemize', 'enumerate', 'description', 'quote', 'verbatim', 'tabular')
+
+_DOC_CLASS_RE = re.compile(r'\\documentclass(?:\[(.*?)\])?\{(.*?)\}')
+_USEPACKAGE_RE = re.compile(r'\\usepackage(?:\[(.*?)\])?\{(.*?)\}')
+
+# 文档环境边界标记，用str.find定位后切片取正文
+_BEGIN_DOCUMENT = '\\begin{document}'
+_END_DOCUMENT = '\\end{document}'
+# 增量读取导言区时的块大小
+_PREAMBLE_CHUNK_SIZE = 8192
+# 章节与环境的合并交替模式，单次扫描正文同时提取两类结构
+_STRUCT_RE = re.compile(
+    r'\\(?P<sec>section|subsection|subsubsection|paragraph|subparagraph)\{(?P<sec_title>.*?)\}'
+    r'|\\begin\{(?P<env>[^}]+)\}(?P<env_body>.*?)\\end\{(?P=env)\}',
+    re.DOTALL,
+)
+
+# 每个标题命令/环境的renew定义正则，按名称预编译一次
+_RENEWCOMMAND_RES = {
+    cmd: re.compile(r'\\renewcommand{\\' + cmd + r'}{(.*?)}') for cmd in _HEADING_COMMANDS
+}
+_RENEWENVIRONMENT_RES = {
+    env: re.compile(r'\\renewenvironment{' + env + r'}{(.*?)}{(.*?)}') for env in _ENVIRONMENTS
+}
+
+# 无renew定义时的默认样式字典，模块级构建一次，
+# 按解析结果的只读契约跨次解析共享，不再每次重建f-string
+_HEADING_DEFAULTS = {
+    cmd: {'type': 'heading', 'definition': f'\\{cmd}'} for cmd in _HEADING_COMMANDS
+}
+_ENV_DEFAULTS = {
+    env: {'type': 'environment', 'begin_def': f'\\begin{{{env}}}', 'end_def': f'\\end{{{env}}}'}
+    for env in _ENVIRONMENTS
+}
+
+# 章节命令 -> 预构建的级别/命令骨架，循环内展开复用，
+# 免去每个匹配的f-string插值和第二次dict查找
+_SECTION_META = {
+    cmd: {'level': level, 'command': '\\' + cmd}
+    for level, cmd in enumerate(_HEADING_COMMANDS, 1)
+}
+
+
+class _LazyTemplate(dict):
+    """
+    延迟求值的模板结构字典
+
+    'structure'、'page_settings'这类开销较大的键在首次访问时才真正
+    解析并缓存进字典；下游只用到样式时完全跳过正文段落/表格遍历。
+    对调用方表现为普通dict，仍遵守解析结果的只读契约。
+    """
+
+    def __init__(self, base: Dict[str, Any], loaders: Dict[str, Any]):
+        """
+        Args:
+            base: 立即可用的键值（type/path/styles等）
+            loaders: 惰性键 -> 无参求值函数
+        """
+        super().__init__(base)
+        self._loaders = loaders
+
+    def __missing__(self, key):
+        loader = self._loaders.get(key)
+        if loader is None:
+            raise KeyError(key)
+        value = loader()
+        self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        if key in self._loaders and not super().__contains__(key):
+            return self[key]
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._loaders
+
 
 class TemplateParser(ABC):
     """
@@ -37,6 +188,8 @@ class TemplateParser(ABC):
 class DocxTemplateParser(TemplateParser):
     """
     .docx格式模板解析器
+
+    解析器无状态，单个实例可跨调用、跨线程安全复用。
     """
     
     def parse(self, template_file: str) -> Dict[str, Any]:
@@ -50,85 +203,128 @@ class DocxTemplateParser(TemplateParser):
             结构化的模板表示
         """
         logger.info(f"解析.docx模板: {template_file}")
-        
+
         try:
-            doc = docx.Document(template_file)
-            
+            styles_root, body = self._load_roots(template_file)
+
             # 提取样式信息
-            styles = self._extract_styles(doc)
-            
-            # 提取文档结构
-            structure = self._extract_structure(doc)
-            
-            # 提取页面设置
-            page_settings = self._extract_page_settings(doc)
-            
-            template_info = {
-                'type': 'docx',
-                'path': template_file,
-                'styles': styles,
-                'structure': structure,
-                'page_settings': page_settings
-            }
-            
-            logger.info(f"解析完成，提取了 {len(styles)} 个样式和 {len(structure)} 个结构元素")
+            styles = self._extract_styles(styles_root)
+
+            # 文档结构与页面设置延迟到首次访问时再提取，
+            # 下游只消费样式时跳过整个正文遍历
+            template_info = _LazyTemplate(
+                {
+                    'type': 'docx',
+                    'path': template_file,
+                    'styles': styles,
+                },
+                {
+                    'structure': lambda: self._extract_structure(styles_root, body),
+                    'page_settings': lambda: self._extract_page_settings(body),
+                },
+            )
+
+            logger.info(f"解析完成，提取了 {len(styles)} 个样式")
             return template_info
-            
+
         except Exception as e:
             logger.error(f"解析.docx模板时出错: {str(e)}", exc_info=True)
             raise
+
+    @staticmethod
+    def _load_roots(template_file: str):
+        """
+        加载模板的样式表根元素和文档body元素
+
+        直接按zip读取word/styles.xml与word/document.xml并用lxml解析，
+        跳过python-docx装配整个包对象树（部件、关系、编号、主题等）
+        的开销；遇到结构特殊的包时回退到python-docx完整加载。
+
+        Args:
+            template_file: .docx模板文件路径
+
+        Returns:
+            (styles_root, body)元组
+        """
+        try:
+            with zipfile.ZipFile(template_file) as z:
+                styles_root = etree.fromstring(z.read(_STYLES_PART))
+                doc_root = etree.fromstring(z.read(_DOCUMENT_PART))
+            body = doc_root.find(_W_BODY_TAG)
+            if body is None:
+                raise ValueError(f"{_DOCUMENT_PART} 中缺少w:body")
+            return styles_root, body
+        except Exception as e:
+            logger.info(f"直接解析docx包失败（{str(e)}），回退到python-docx加载")
+            doc = docx.Document(template_file)
+            return doc.styles.element, doc.element.body
     
-    def _extract_styles(self, doc: DocxDocument) -> Dict[str, Dict[str, Any]]:
+    def _extract_styles(self, styles_root) -> Dict[str, Dict[str, Any]]:
         """
         提取文档中的样式定义
-        
+
         Args:
-            doc: docx文档对象
-            
+            styles_root: word/styles.xml的根元素
+
         Returns:
             样式定义字典
         """
         styles = {}
-        
-        # 修复：使用doc.styles的名称列表而不是直接遍历style_id
-        for style_name in doc.styles.element.xpath('//w:style/@w:styleId'):
-            try:
-                style = doc.styles[style_name]
-                if isinstance(style, _ParagraphStyle):
-                    style_info = {
-                        'name': style.name,
-                        'font': {},
-                        'paragraph': {}
+
+        # styleId -> 样式元素映射，供basedOn继承链查找
+        id_to_elem = {}
+        for el in styles_root.iterchildren(_W_STYLE_TAG):
+            if style_id := el.get(_W_STYLE_ID_ATTR):
+                id_to_elem[style_id] = el
+
+        # styleId -> 有效属性缓存：沿basedOn链合并一次后复用，
+        # 共享基样式的多个样式不再重复读取继承的属性
+        effective_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        def effective(style_id: str) -> Dict[str, Dict[str, Any]]:
+            cached = effective_cache.get(style_id)
+            if cached is not None:
+                return cached
+
+            el = id_to_elem.get(style_id)
+            if el is None:
+                props = {'font': {}, 'paragraph': {}}
+            else:
+                own = self._read_style_props(el)
+                based_on = el.find(_W_BASED_ON_TAG)
+                base_id = based_on.get(_W_VAL_ATTR) if based_on is not None else None
+                if base_id:
+                    base = effective(base_id)
+                    props = {
+                        'font': {**base['font'], **own['font']},
+                        'paragraph': {**base['paragraph'], **own['paragraph']},
                     }
-                    
-                    # 提取字体信息
-                    if hasattr(style, 'font') and style.font:
-                        if hasattr(style.font, 'name') and style.font.name:
-                            style_info['font']['name'] = style.font.name
-                        if hasattr(style.font, 'size') and style.font.size:
-                            style_info['font']['size'] = style.font.size
-                        if hasattr(style.font, 'bold') and style.font.bold:
-                            style_info['font']['bold'] = style.font.bold
-                        if hasattr(style.font, 'italic') and style.font.italic:
-                            style_info['font']['italic'] = style.font.italic
-                    
-                    # 提取段落信息
-                    if hasattr(style, 'paragraph_format') and style.paragraph_format:
-                        pf = style.paragraph_format
-                        if hasattr(pf, 'alignment') and pf.alignment:
-                            style_info['paragraph']['alignment'] = str(pf.alignment)
-                        if hasattr(pf, 'line_spacing') and pf.line_spacing:
-                            style_info['paragraph']['line_spacing'] = pf.line_spacing
-                        if hasattr(pf, 'space_before') and pf.space_before:
-                            style_info['paragraph']['space_before'] = pf.space_before
-                        if hasattr(pf, 'space_after') and pf.space_after:
-                            style_info['paragraph']['space_after'] = pf.space_after
-                        if hasattr(pf, 'first_line_indent') and pf.first_line_indent:
-                            style_info['paragraph']['first_line_indent'] = pf.first_line_indent
-                    
-                    styles[style.name] = style_info
+                else:
+                    props = own
+
+            effective_cache[style_id] = props
+            return props
+
+        # 直接遍历样式表的w:style子元素，避免逐样式的XPath扫描
+        # 和doc.styles[name]按名称的线性查找（N+1遍历）
+        for style_el in styles_root.iterchildren(_W_STYLE_TAG):
+            if style_el.get(_W_TYPE_ATTR) != 'paragraph':
+                continue
+
+            try:
+                name_el = style_el.find(_W_NAME_TAG)
+                style_name = name_el.get(_W_VAL_ATTR) if name_el is not None else style_el.get(_W_STYLE_ID_ATTR)
+                # 内置样式的内部名（如'heading 1'）转换为界面名（'Heading 1'），与python-docx保持一致
+                style_name = BabelFish.internal2ui(style_name)
+
+                props = effective(style_el.get(_W_STYLE_ID_ATTR) or '')
+                styles[style_name] = {
+                    'name': style_name,
+                    'font': props['font'],
+                    'paragraph': props['paragraph']
+                }
             except Exception as e:
-                logger.warning(f"提取样式 {style_name} 时出错: {str(e)}")
+                logger.warning(f"提取样式 {style_el.get(_W_STYLE_ID_ATTR)} 时出错: {str(e)}")
                 continue
         
         # 确保基本样式存在
@@ -150,95 +346,210 @@ class DocxTemplateParser(TemplateParser):
         
         return styles
     
-    def _extract_structure(self, doc: DocxDocument) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _read_style_props(style_el) -> Dict[str, Dict[str, Any]]:
+        """
+        读取单个w:style元素自身定义的字体与段落属性
+
+        只读该样式显式声明的属性，不含basedOn继承的部分；
+        继承合并由_extract_styles内的有效属性缓存完成。
+
+        Args:
+            style_el: 样式表中的w:style元素
+
+        Returns:
+            {'font': {...}, 'paragraph': {...}}形式的属性字典
+        """
+        font_info: Dict[str, Any] = {}
+        para_info: Dict[str, Any] = {}
+
+        # 提取字体信息：直接读XML子元素，跳过python-docx描述符属性
+        rpr = style_el.find(_W_RPR_TAG)
+        if rpr is not None:
+            rfonts = rpr.find(_W_RFONTS_TAG)
+            if rfonts is not None and (font_name := rfonts.get(_W_ASCII_ATTR)):
+                font_info['name'] = font_name
+            sz = rpr.find(_W_SZ_TAG)
+            if sz is not None and (sz_val := sz.get(_W_VAL_ATTR)):
+                # w:sz以半磅为单位
+                font_info['size'] = Pt(int(sz_val) / 2)
+            if _on_off(rpr.find(_W_B_TAG)):
+                font_info['bold'] = True
+            if _on_off(rpr.find(_W_I_TAG)):
+                font_info['italic'] = True
+
+        # 提取段落信息
+        ppr = style_el.find(_W_PPR_TAG)
+        if ppr is not None:
+            jc = ppr.find(_W_JC_TAG)
+            if jc is not None and (jc_val := jc.get(_W_VAL_ATTR)):
+                para_info['alignment'] = jc_val
+            spacing = ppr.find(_W_SPACING_TAG)
+            if spacing is not None:
+                if line := spacing.get(_W_LINE_ATTR):
+                    # lineRule为auto（或缺省）时是240分之一行的倍数，否则为twips定距
+                    rule = spacing.get(_W_LINE_RULE_ATTR)
+                    para_info['line_spacing'] = (
+                        int(line) / 240 if rule in (None, 'auto') else Twips(int(line))
+                    )
+                if before := spacing.get(_W_BEFORE_ATTR):
+                    para_info['space_before'] = Twips(int(before))
+                if after := spacing.get(_W_AFTER_ATTR):
+                    para_info['space_after'] = Twips(int(after))
+            ind = ppr.find(_W_IND_TAG)
+            if ind is not None:
+                if hanging := ind.get(_W_HANGING_ATTR):
+                    para_info['first_line_indent'] = -Twips(int(hanging))
+                elif first_line := ind.get(_W_FIRST_LINE_ATTR):
+                    para_info['first_line_indent'] = Twips(int(first_line))
+
+        return {'font': font_info, 'paragraph': para_info}
+
+    @staticmethod
+    def _style_id_to_name(styles_root) -> Dict[str, str]:
+        """构建styleId到样式名（界面名）的映射"""
+        id_to_name = {}
+        for style_el in styles_root.iterchildren(_W_STYLE_TAG):
+            style_id = style_el.get(_W_STYLE_ID_ATTR)
+            if not style_id:
+                continue
+            name_el = style_el.find(_W_NAME_TAG)
+            if name_el is not None:
+                id_to_name[style_id] = BabelFish.internal2ui(name_el.get(_W_VAL_ATTR))
+            else:
+                id_to_name[style_id] = style_id
+        return id_to_name
+
+    def _extract_structure(self, styles_root, body) -> List[Dict[str, Any]]:
         """
         提取文档结构
-        
+
         Args:
-            doc: docx文档对象
-            
+            styles_root: word/styles.xml的根元素
+            body: 文档的w:body元素
+
         Returns:
             结构元素列表
         """
         structure = []
-        
-        # 处理段落
-        for i, para in enumerate(doc.paragraphs):
-            if not para.text.strip():
+
+        # styleId -> 样式名的映射，一次构建后供全部段落查表，
+        # 避免每个段落经para.style.name触发python-docx的描述符链
+        id_to_name = self._style_id_to_name(styles_root)
+
+        # 处理段落：直接遍历body的顶层w:p子元素，不分配Paragraph包装对象
+        for i, p in enumerate(body.iterchildren(_W_P_TAG)):
+            # 无任何w:t子元素的段落直接跳过，不做文本拼接
+            if next(p.iter(_W_T_TAG), None) is None:
+                continue
+            text = ''.join(t.text or '' for t in p.iter(_W_T_TAG))
+            if not text.strip():
                 continue  # 跳过空段落
-                
+
+            ppr = p.find(_W_PPR_TAG)
+            pstyle = ppr.find(_W_PSTYLE_TAG) if ppr is not None else None
+            style_id = pstyle.get(_W_VAL_ATTR) if pstyle is not None else None
+            style_name = id_to_name.get(style_id, style_id) if style_id else 'Normal'
+
             para_info = {
                 'type': 'paragraph',
                 'index': i,
-                'text': para.text,
-                'style': para.style.name if para.style else 'Normal'
+                'text': text,
+                'style': style_name
             }
-            
+
             # 检查是否为标题
-            if para.style and para.style.name.startswith('Heading'):
+            if style_name.startswith('Heading'):
                 try:
-                    level = int(para.style.name.split(' ')[1])
+                    level = int(style_name.split(' ')[1])
                     para_info['type'] = 'heading'
                     para_info['level'] = level
                 except (IndexError, ValueError):
                     pass
-            
+
             structure.append(para_info)
         
-        # 处理表格
-        for i, table in enumerate(doc.tables):
+        # 处理表格：同样直接遍历XML，跳过Table/Row/Cell包装对象的逐格分配
+        for i, tbl in enumerate(body.iterchildren(_W_TBL_TAG)):
+            trs = tbl.findall(_W_TR_TAG)
+            grid = tbl.find(_W_TBLGRID_TAG)
+
             table_info = {
                 'type': 'table',
                 'index': i,
-                'rows': len(table.rows),
-                'cols': len(table.columns),
+                'rows': len(trs),
+                'cols': len(grid.findall(_W_GRIDCOL_TAG)) if grid is not None else 0,
                 'cells': []
             }
-            
-            for r, row in enumerate(table.rows):
-                for c, cell in enumerate(row.cells):
+
+            for r, tr in enumerate(trs):
+                for c, tc in enumerate(tr.findall(_W_TC_TAG)):
+                    # 预编译XPath直接取属性值，免去逐格拼接路径字符串
+                    style_ids = _XP_CELL_PSTYLE(tc)
+                    style_id = style_ids[0] if style_ids else None
+
                     cell_info = {
                         'row': r,
                         'col': c,
-                        'text': cell.text,
-                        'style': cell.paragraphs[0].style.name if cell.paragraphs and cell.paragraphs[0].style else 'Normal'
+                        'text': ''.join(t.text or '' for t in tc.iter(_W_T_TAG)),
+                        'style': id_to_name.get(style_id, style_id) if style_id else 'Normal'
                     }
                     table_info['cells'].append(cell_info)
-            
+
             structure.append(table_info)
         
         return structure
     
-    def _extract_page_settings(self, doc: DocxDocument) -> Dict[str, Any]:
+    def _extract_page_settings(self, body) -> Dict[str, Any]:
         """
         提取页面设置
-        
+
+        直接从第一个w:sectPr读取pgSz/pgMar，twips数值转换为与
+        python-docx Section属性一致的长度对象。
+
         Args:
-            doc: docx文档对象
-            
+            body: 文档的w:body元素
+
         Returns:
             页面设置字典
         """
         settings = {}
-        
-        # 提取页面大小和边距
-        for section in doc.sections:
-            settings['page_width'] = section.page_width
-            settings['page_height'] = section.page_height
-            settings['left_margin'] = section.left_margin
-            settings['right_margin'] = section.right_margin
-            settings['top_margin'] = section.top_margin
-            settings['bottom_margin'] = section.bottom_margin
-            settings['header_distance'] = section.header_distance
-            settings['footer_distance'] = section.footer_distance
-            break  # 只处理第一个section
-        
+
+        # 按文档顺序取第一个sectPr（多分节模板中为段落pPr内的那个），
+        # 与doc.sections[0]的口径一致
+        matches = _XP_ANY_SECTPR(body)
+        if not matches:
+            return settings
+        sectpr = matches[0]
+
+        pgsz = sectpr.find(_W_PGSZ_TAG)
+        if pgsz is not None:
+            if w := pgsz.get(_W_W_ATTR):
+                settings['page_width'] = Twips(int(w))
+            if h := pgsz.get(_W_H_ATTR):
+                settings['page_height'] = Twips(int(h))
+
+        pgmar = sectpr.find(_W_PGMAR_TAG)
+        if pgmar is not None:
+            for key, attr in (
+                ('left_margin', _W_LEFT_ATTR),
+                ('right_margin', _W_RIGHT_ATTR),
+                ('top_margin', _W_TOP_ATTR),
+                ('bottom_margin', _W_BOTTOM_ATTR),
+                ('header_distance', _W_HEADER_ATTR),
+                ('footer_distance', _W_FOOTER_ATTR),
+            ):
+                if val := pgmar.get(attr):
+                    settings[key] = Twips(int(val))
+
         return settings
 
 
 class TexTemplateParser(TemplateParser):
     """
     .tex格式模板解析器
+
+    解析器无状态，单个实例可跨调用、跨线程安全复用。
     """
     
     def parse(self, template_file: str) -> Dict[str, Any]:
@@ -252,20 +563,20 @@ class TexTemplateParser(TemplateParser):
             结构化的模板表示
         """
         logger.info(f"解析.tex模板: {template_file}")
-        
+
         try:
-            with open(template_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+            # 导言区与正文分开读取：文档类/包/样式扫描只跑短得多的导言区
+            preamble, body = self._read_split(template_file)
+
             # 提取文档类和包
-            document_class = self._extract_document_class(content)
-            packages = self._extract_packages(content)
-            
+            document_class = self._extract_document_class(preamble)
+            packages = self._extract_packages(preamble)
+
             # 提取样式信息
-            styles = self._extract_styles(content)
-            
+            styles = self._extract_styles(preamble)
+
             # 提取文档结构
-            structure = self._extract_structure(content)
+            structure = self._extract_structure(body)
             
             template_info = {
                 'type': 'tex',
@@ -282,7 +593,35 @@ class TexTemplateParser(TemplateParser):
         except Exception as e:
             logger.error(f"解析.tex模板时出错: {str(e)}", exc_info=True)
             raise
-    
+
+    @staticmethod
+    def _read_split(template_file: str) -> tuple:
+        """
+        读取模板文件并按\\begin{document}切分为导言区和正文
+
+        按块增量读取，找到文档环境起点后才整读剩余部分；导言区
+        扫描器因此只处理短得多的字符串，峰值内存也不再是整文件
+        的两倍。无文档环境时整个文件作为导言区返回。
+
+        Args:
+            template_file: .tex模板文件路径
+
+        Returns:
+            (导言区内容, 从\\begin{document}起的正文内容)元组
+        """
+        buf = ''
+        with open(template_file, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(_PREAMBLE_CHUNK_SIZE)
+                if not chunk:
+                    return buf, ''
+                # 从上一块尾部回退标记长度再查找，覆盖跨块边界的标记
+                search_from = max(0, len(buf) - len(_BEGIN_DOCUMENT) + 1)
+                buf += chunk
+                pos = buf.find(_BEGIN_DOCUMENT, search_from)
+                if pos >= 0:
+                    return buf[:pos], buf[pos:] + f.read()
+
     def _extract_document_class(self, content: str) -> Dict[str, Any]:
         """
         提取文档类定义
@@ -296,8 +635,7 @@ class TexTemplateParser(TemplateParser):
         document_class = {'name': '', 'options': []}
         
         # 匹配文档类定义
-        pattern = r'\\documentclass(?:\[(.*?)\])?\{(.*?)\}'
-        match = re.search(pattern, content)
+        match = _DOC_CLASS_RE.search(content)
         if match:
             options_str = match.group(1)
             class_name = match.group(2)
@@ -319,25 +657,19 @@ class TexTemplateParser(TemplateParser):
             包信息列表
         """
         packages = []
-        
-        # 匹配包引用
-        pattern = r'\\usepackage(?:\[(.*?)\])?\{(.*?)\}'
-        matches = re.finditer(pattern, content)
-        
-        for match in matches:
-            options_str = match.group(1)
-            package_name = match.group(2)
-            
+
+        # findall直接返回分组元组列表，省去逐个Match对象的分配与group()调用
+        for options_str, package_name in _USEPACKAGE_RE.findall(content):
             package_info = {
                 'name': package_name,
                 'options': []
             }
-            
+
             if options_str:
                 package_info['options'] = [opt.strip() for opt in options_str.split(',')]
-            
+
             packages.append(package_info)
-        
+
         return packages
     
     def _extract_styles(self, content: str) -> Dict[str, Dict[str, Any]]:
@@ -352,29 +684,20 @@ class TexTemplateParser(TemplateParser):
         """
         styles = {}
         
-        # 提取标题样式
-        heading_commands = ['section', 'subsection', 'subsubsection', 'paragraph', 'subparagraph']
-        for cmd in heading_commands:
-            # 检查是否有自定义标题格式
-            pattern = r'\\renewcommand{\\' + cmd + r'}{(.*?)}'
-            match = re.search(pattern, content)
+        # 提取标题样式，无自定义格式时复用模块级默认字典
+        for cmd in _HEADING_COMMANDS:
+            match = _RENEWCOMMAND_RES[cmd].search(content)
             if match:
                 styles[cmd] = {
                     'type': 'heading',
                     'definition': match.group(1)
                 }
             else:
-                styles[cmd] = {
-                    'type': 'heading',
-                    'definition': f'\\{cmd}'
-                }
-        
-        # 提取环境样式
-        environments = ['itemize', 'enumerate', 'description', 'quote', 'verbatim', 'tabular']
-        for env in environments:
-            # 检查是否有自定义环境
-            pattern = r'\\renewenvironment{' + env + r'}{(.*?)}{(.*?)}'
-            match = re.search(pattern, content)
+                styles[cmd] = _HEADING_DEFAULTS[cmd]
+
+        # 提取环境样式，无自定义环境时同样复用默认字典
+        for env in _ENVIRONMENTS:
+            match = _RENEWENVIRONMENT_RES[env].search(content)
             if match:
                 styles[env] = {
                     'type': 'environment',
@@ -382,12 +705,8 @@ class TexTemplateParser(TemplateParser):
                     'end_def': match.group(2)
                 }
             else:
-                styles[env] = {
-                    'type': 'environment',
-                    'begin_def': f'\\begin{{{env}}}',
-                    'end_def': f'\\end{{{env}}}'
-                }
-        
+                styles[env] = _ENV_DEFAULTS[env]
+
         return styles
     
     def _extract_structure(self, content: str) -> List[Dict[str, Any]]:
@@ -402,51 +721,32 @@ class TexTemplateParser(TemplateParser):
         """
         structure = []
         
-        # 提取文档主体部分
-        body_pattern = r'\\begin{document}(.*?)\\end{document}'
-        body_match = re.search(body_pattern, content, re.DOTALL)
-        if not body_match:
+        # 提取文档主体部分：C层str.find定位边界，比DOTALL正则逐字符扫描快得多
+        begin_pos = content.find(_BEGIN_DOCUMENT)
+        if begin_pos < 0:
             return structure
-        
-        body_content = body_match.group(1)
-        
-        # 提取章节标题
-        section_pattern = r'\\(section|subsection|subsubsection|paragraph|subparagraph)\{(.*?)\}'
-        section_matches = re.finditer(section_pattern, body_content)
-        
-        for match in section_matches:
-            section_type = match.group(1)
-            section_title = match.group(2)
-            
-            level_map = {
-                'section': 1,
-                'subsection': 2,
-                'subsubsection': 3,
-                'paragraph': 4,
-                'subparagraph': 5
-            }
-            
-            structure.append({
-                'type': 'heading',
-                'level': level_map.get(section_type, 1),
-                'text': section_title,
-                'command': f'\\{section_type}'
-            })
-        
-        # 提取环境
-        env_pattern = r'\\begin\{(.*?)\}(.*?)\\end\{\1\}'
-        env_matches = re.finditer(env_pattern, body_content, re.DOTALL)
-        
-        for match in env_matches:
-            env_type = match.group(1)
-            env_content = match.group(2)
-            
-            structure.append({
-                'type': 'environment',
-                'env_type': env_type,
-                'content': env_content.strip()
-            })
-        
+        end_pos = content.find(_END_DOCUMENT, begin_pos)
+        if end_pos < 0:
+            return structure
+
+        body_content = content[begin_pos + len(_BEGIN_DOCUMENT):end_pos]
+
+        # 单次扫描正文，findall按分组返回元组，空串标记未命中的一侧；
+        # 章节命令名非空即为标题，否则为环境，结果保持文档原有顺序
+        for section_type, sec_title, env_type, env_body in _STRUCT_RE.findall(body_content):
+            if section_type:
+                structure.append({
+                    'type': 'heading',
+                    'text': sec_title,
+                    **_SECTION_META[section_type]
+                })
+            else:
+                structure.append({
+                    'type': 'environment',
+                    'env_type': env_type,
+                    'content': env_body.strip()
+                })
+
         return structure
 
 
@@ -456,10 +756,13 @@ class TemplateParserFactory:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def create_parser(format_type: str) -> TemplateParser:
         """
         创建模板解析器
-        
+
+        解析器本身无状态，按格式类型缓存实例并跨调用复用。
+
         Args:
             format_type: 模板格式类型
             
@@ -472,3 +775,29 @@ class TemplateParserFactory:
             return TexTemplateParser()
         else:
             raise ValueError(f"不支持的模板格式: {format_type}")
+
+    @staticmethod
+    def parse_template(template_file: str, format_type: str) -> Dict[str, Any]:
+        """
+        解析模板文件，结果按(路径, mtime_ns, 大小)缓存
+
+        模板文件未修改时直接返回缓存的解析结构，修改后缓存键随
+        mtime/大小变化自动失效。按只读契约，命中时返回的结构与
+        缓存共享引用，调用方不应改写。
+
+        Args:
+            template_file: 模板文件路径
+            format_type: 模板格式类型
+
+        Returns:
+            结构化的模板表示
+        """
+        st = os.stat(template_file)
+        return _parse_template_cached(template_file, st.st_mtime_ns, st.st_size, format_type)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_template_cached(template_file: str, mtime_ns: int, size: int, format_type: str) -> Dict[str, Any]:
+    """按文件标识缓存的模板解析入口，mtime_ns/size仅参与缓存键"""
+    parser = TemplateParserFactory.create_parser(format_type)
+    return parser.parse(template_file)
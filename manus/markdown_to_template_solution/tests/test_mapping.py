@@ -89,9 +89,11 @@ AI在医院管理、患者流程优化和医疗资源分配等方面也发挥着
 """
     
     sample_md_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_article.md')
-    with open(sample_md_path, 'w', encoding='utf-8') as f:
-        f.write(sample_md)
-    
+    # 文件已存在时跳过重写，重复调用不再产生多余的磁盘写入
+    if not os.path.exists(sample_md_path):
+        with open(sample_md_path, 'w', encoding='utf-8') as f:
+            f.write(sample_md)
+
     return sample_md_path
 
 
@@ -210,12 +212,13 @@ def create_sample_tex_template():
     return template_path
 
 
-def test_docx_mapping():
+def test_docx_mapping(markdown_file=None):
     """测试Markdown到.docx模板的映射"""
     logger.info("开始测试Markdown到.docx模板的映射")
-    
-    # 创建示例文件
-    markdown_file = create_sample_markdown()
+
+    # 创建示例文件，示例Markdown可由调用方传入复用
+    if markdown_file is None:
+        markdown_file = create_sample_markdown()
     template_file = create_sample_docx_template()
     
     # 设置输出文件路径
@@ -236,12 +239,13 @@ def test_docx_mapping():
         return False
 
 
-def test_tex_mapping():
+def test_tex_mapping(markdown_file=None):
     """测试Markdown到.tex模板的映射"""
     logger.info("开始测试Markdown到.tex模板的映射")
-    
-    # 创建示例文件
-    markdown_file = create_sample_markdown()
+
+    # 创建示例文件，示例Markdown可由调用方传入复用
+    if markdown_file is None:
+        markdown_file = create_sample_markdown()
     template_file = create_sample_tex_template()
     
     # 设置输出文件路径
@@ -269,13 +273,16 @@ def main():
                         help='要测试的模板格式')
     
     args = parser.parse_args()
-    
+
+    # 示例Markdown只生成一次，两种格式的测试共用同一个文件
+    markdown_file = create_sample_markdown()
+
     if args.format == 'docx' or args.format == 'all':
-        docx_result = test_docx_mapping()
+        docx_result = test_docx_mapping(markdown_file)
         print(f"Markdown到.docx模板映射测试: {'成功' if docx_result else '失败'}")
-    
+
     if args.format == 'tex' or args.format == 'all':
-        tex_result = test_tex_mapping()
+        tex_result = test_tex_mapping(markdown_file)
         print(f"Markdown到.tex模板映射测试: {'成功' if tex_result else '失败'}")
 
 
@@ -2,10 +2,60 @@ import docx
 from docx.oxml.ns import qn
 from docx.shared import Pt, Cm, Mm
 from docx.enum.text import *
+import functools
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
 from PyQt5.QtWidgets import QApplication, QFileDialog
+
+# 调试开关：逐段控制台输出只在排查时打开，批量处理时print是主要的墙钟开销
+DEBUG = False
+
+# 中英文标点替换表，模块加载时构建一次，str.translate单遍完成全部替换
+_PUNCT_TABLE = str.maketrans({
+    ',': '，', ';': '；', ':': '：', '!': '！', '?': '？',
+    '(': '（', ')': '）', ' ': '', '\t': '', '\n': '',
+})
+_W_T = qn('w:t')
+
+# 标题/落款判定用的字符集，frozenset成员判断O(1)，模块级构建一次
+cn_num = frozenset("一二三四五六七八九十")
+num = frozenset("1234567890")
+punc = frozenset("。，！？：；、.（）．")
+must = frozenset("要是能")
+
+# 各级标题格式的预编译正则，一次C层match代替逐字符下标判断
+_RE_G1 = re.compile(r'^[一二三四五六七八九十]{1,2}、')
+_RE_G2 = re.compile(r'^（[一二三四五六七八九十]{1,2}）')
+_RE_G3 = re.compile(r'^[0-9]{1,2}[。，！？：；、.（）．]')
+_RE_G4 = re.compile(r'^（[0-9]{1,2}）')
+_RE_G5 = re.compile(r'^[一二三四五六七八九十][要是能]')
+
+# 排版用的磅值与限定名常量，模块级构建一次，循环内不再逐次分配Emu对象/拼接qn
+_PT0, _PT16, _PT22, _PT28, _PT32, _PT288 = Pt(0), Pt(16), Pt(22), Pt(28), Pt(32), Pt(288)
+_QN_EASTASIA = qn('w:eastAsia')
+# 缩进相关的w:ind属性限定名，同样只算一次
+_QN_FIRST_LINE_CHARS = qn("w:firstLineChars")
+_QN_FIRST_LINE = qn("w:firstLine")
+_QN_LEFT_CHARS = qn("w:leftChars")
+_QN_LEFT = qn("w:left")
+_QN_RIGHT_CHARS = qn("w:rightChars")
+_QN_RIGHT = qn("w:right")
+# 缩进清零的属性字典，一次attrib.update替代六次set
+_IND_RESET = {
+    _QN_FIRST_LINE_CHARS: '0',
+    _QN_FIRST_LINE: '0',
+    _QN_LEFT_CHARS: '0',
+    _QN_LEFT: '0',
+    _QN_RIGHT_CHARS: '0',
+    _QN_RIGHT: '0',
+}
+#判断段落是否无文本：遇到第一个非空w:t即短路，不拼接整段文本
+def _is_empty(paragraph):
+    return not any(t.text for t in paragraph._element.iter(_W_T))
+
 # 删除段落
 def delete_paragraph(paragraph):
     p = paragraph._element
@@ -15,6 +65,8 @@ def delete_paragraph(paragraph):
  
 #判断是否为落款格式
 def LuoKuan(str):
+    if not str:
+        return False
     for i in str:
         if i in punc:
             return False
@@ -33,216 +85,263 @@ def setMargin(docx):
  
 #判断是否为一级标题格式（如：一、xxx）
 def GradeOneTitle(str):
-    if ((str[0] in cn_num) and (str[1] == "、")) or ((str[0] in cn_num) and (str[1] in cn_num) and (str[2] == "、")):
-        return True
-    else:
-        return False
- 
+    return bool(_RE_G1.match(str))
+
 #判断是否为二级标题格式（如：（一）xxx）
 def GradeTwoTitle(str):
-    if ((str[0] == "（") and (str[1] in cn_num) and (str[2] == "）")) or ((str[0] == "（") and (str[1] in cn_num) and (str[2] in cn_num) and (str[3] == "）")):
-        return True
-    else:
-        return False
+    return bool(_RE_G2.match(str))
 #判断是否为三级标题格式（如：1.xxx）
 def GradeThreeTitle(str):
-    if ((str[0] in num) and (str[1] in punc)) or ((str[0] in num) and (str[1] in num) and (str[2] in punc)):
-        return True
-    else:
-        return False
+    return bool(_RE_G3.match(str))
 #判断是否为四级标题格式（如：（1）xxx）
 def GradeFourTitle(str):
-    if ((str[0] == "（") and (str[1] in num) and (str[2] == "）")) or ((str[0] == "（") and (str[1] in num) and (str[2] in num) and (str[3] == "）")):
-        return True
-    else:
-        return False
- 
+    return bool(_RE_G4.match(str))
+
 #判断是否为五级标题格式（如：一是XXX）
 def GradeFiveTitle(str):
-    if ((str[0] in cn_num) and (str[1] in must)) or ((str[0] in cn_num) and (str[1] in cn_num) and (str[1] in must)):
-        return True
+    return bool(_RE_G5.match(str))
+
+#按前缀分类标题格式并缓存：各级标题正则最长只看前4个字符
+#（如"（十一）"/"（12）"），相同前缀的run（公文序号高度重复）直接命中缓存
+@functools.lru_cache(maxsize=2048)
+def _classify_prefix(prefix):
+    if _RE_G1.match(prefix):
+        return 'G1'
+    if _RE_G2.match(prefix):
+        return 'G2'
+    if _RE_G3.match(prefix):
+        return 'G3'
+    if _RE_G4.match(prefix):
+        return 'G4'
+    if _RE_G5.match(prefix):
+        return 'G5'
+    return None
+
+#分类run文本，返回标题级别标签，普通正文返回'BODY'
+def _classify(rtext):
+    tag = _classify_prefix(rtext[:4])
+    if tag is not None:
+        return tag
+    # 落款判定依赖整串内容（结尾字符与总长度），不能按前缀缓存
+    if LuoKuan(rtext):
+        return 'LK'
+    return 'BODY'
+
+#首句拆分加粗：句号前的部分新起一段加粗，其余保持常规字重（G3/G4/G5共用）
+def _split_sentence_bold(paragraph, rtext):
+    # partition单次扫描同时取句号前后两段，代替两次split
+    head, sep, tail = rtext.partition('。')
+    sentence_to_bold = head + sep
+    sentence_not_to_bold = tail
+    # insert_paragraph_before直接返回新段落，
+    # 不再经document.paragraphs逐次重建整个段落列表来定位
+    newp = paragraph.insert_paragraph_before(sentence_to_bold)
+    newp.paragraph_format.first_line_indent = _PT32
+    newp.paragraph_format.line_spacing = _PT28  # 行距固定值28磅
+    newp.paragraph_format.space_after = _PT0  # 段后间距=0
+    bold_run = newp.runs[0]
+    bold_run.font.name = '仿宋_GB2312'
+    bold_run.font.size = _PT16  # 字体大小3号
+    bold_run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+    bold_run.bold = True  # 字体加粗
+    rest_run = newp.add_run(sentence_not_to_bold)
+    rest_run.bold = False
+    rest_run.font.name = '仿宋_GB2312'
+    rest_run.font.size = _PT16  # 字体大小3号
+    rest_run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+    delete_paragraph(paragraph)
+
+#一级标题（如：一、xxx）
+def _apply_g1(run, paragraph, document, paragraphcnt, rtext):
+    run.font.name = '黑体'
+    run.element.rPr.rFonts.set(_QN_EASTASIA, '黑体')
+
+#二级标题（如：（一）xxx）
+def _apply_g2(run, paragraph, document, paragraphcnt, rtext):
+    if "。" not in rtext:
+        run.font.name = '楷体'
+        run.element.rPr.rFonts.set(_QN_EASTASIA, '楷体')
     else:
-        return False
- 
+        run.text = rtext.split('。',1)
+        run.font.name = '楷体'
+        run.element.rPr.rFonts.set(_QN_EASTASIA, '楷体')
+
+#三级标题（如：1.xxx），序号后标点统一为中文句点
+def _apply_g3(run, paragraph, document, paragraphcnt, rtext):
+    if (rtext[0] in num) and (rtext[1] in punc):
+        rtext = rtext.replace(rtext[1], "．", 1)
+        run.text = rtext
+    if (rtext[0] in num) and (rtext[1] in num) and (rtext[2] in punc):
+        rtext = rtext.replace(rtext[2], "．", 1)
+        run.text = rtext
+    if "。" not in rtext:
+        run.font.name = '仿宋_GB2312'
+        run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+        run.bold = True  # 字体加粗
+    else:
+        _split_sentence_bold(paragraph, rtext)
+
+#四级标题（如：（1）xxx）
+def _apply_g4(run, paragraph, document, paragraphcnt, rtext):
+    if "。" not in rtext:
+        run.font.name = '仿宋_GB2312'
+        run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+        run.bold = True  # 字体加粗
+    else:
+        _split_sentence_bold(paragraph, rtext)
+
+#五级标题（如：一是xxx），处理方式与四级标题相同
+_apply_g5 = _apply_g4
+
+#落款
+def _apply_luokuan(run, paragraph, document, paragraphcnt, rtext):
+    run.font.name = '仿宋_GB2312'
+    run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+    run.text = "\r" * 2 + rtext  # 前置空格，顶到最右，需手动调整空格
+    paragraph.paragraph_format.left_indent = _PT288    #18B*16Pt=288Pt
+
+#普通正文格式
+def _apply_body(run, paragraph, document, paragraphcnt, rtext):
+    run.font.name = '仿宋_GB2312'
+    run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+
+#标签 -> 处理函数的分发表，模块加载时绑定一次
+_HANDLERS = {
+    'G1': _apply_g1,
+    'G2': _apply_g2,
+    'G3': _apply_g3,
+    'G4': _apply_g4,
+    'G5': _apply_g5,
+    'LK': _apply_luokuan,
+    'BODY': _apply_body,
+}
+
+#逐段公共预处理：标点替换、空段落删除、缩进清零
+#空段落删除后返回None，否则返回缓存好的段落文本
+def _prepare_paragraph(paragraph):
+    # 直接改写各w:t文本节点，一遍translate替换全部标点；
+    # 不走paragraph.text赋值，避免每次赋值都重建整段run并丢失run边界
+    for t in paragraph._element.iter(_W_T):
+        if t.text and (new_text := t.text.translate(_PUNCT_TABLE)) != t.text:
+            t.text = new_text
+    if _is_empty(paragraph):
+        delete_paragraph(paragraph)
+        return None
+    # 段落文本取一次缓存到局部变量，后续判断不再反复拼接w:t
+    ptext = paragraph.text
+    paragraph.paragraph_format.left_indent = 0  #预先对缩进赋值, 防止对象为空报错
+    paragraph.paragraph_format.element.pPr.ind.attrib.update(_IND_RESET)  #并去除缩进
+    return ptext
+
+#正文段落排版：头部（标题/作者单位/日期）判断已在前置循环完成，这里不再比较段落序号
+def _format_body_paragraph(paragraph, document):
+    paragraph.paragraph_format.line_spacing = _PT28  # 行距固定值28磅
+    paragraph.paragraph_format.space_after = _PT0  # 段后间距=0
+    paragraph.paragraph_format.first_line_indent = _PT32
+    for run in paragraph.runs:
+        run.font.size = _PT16  # 字体大小3号
+        run.bold = False  # 字体不加粗
+        run.font.name = '仿宋_GB2312'
+        run.element.rPr.rFonts.set(_QN_EASTASIA, '仿宋_GB2312')
+        # run文本取一次缓存到局部变量，判定级联不再逐次遍历w:t拼接；
+        # 过短的run不可能命中任何标题/落款格式，直接跳过
+        rtext = run.text
+        if not rtext or len(rtext) < 2:
+            continue
+        # 分类一次后按标签分发到对应处理函数，代替逐个谓词的if/elif级联
+        handler = _HANDLERS[_classify(rtext)]
+        handler(run, paragraph, document, None, rtext)
+
+#对已打开的文档就地排版：不做任何文件读写，可在多趟流水线或测试中直接复用
+#返回是否实际修改了文档
+def _format_document(docx):
+    paragraphcnt = 0
+    # 脏标记：只有实际动过文档才需要保存
+    dirty = False
+    paragraphs = iter(docx.paragraphs)
+    # 头部阶段：只有前三个非空段落需要标题/作者单位/日期的序号判断，
+    # 处理完即跳出，正文循环不再带这三组比较
+    for paragraph in paragraphs:
+        ptext = _prepare_paragraph(paragraph)
+        dirty = True
+        if ptext is None:
+            continue
+        paragraphcnt = paragraphcnt +1
+        if DEBUG:
+            print('这是第%s段' %paragraphcnt)
+            print(ptext)
+        if paragraphcnt == 1 and len(ptext)<40:
+            #处理头部空行
+            #标题（方正小标宋_GBK、2号、加粗、居中、下端按2号字空一行）
+            paragraph.paragraph_format.line_spacing=_PT28  #行距固定值28磅
+            paragraph.paragraph_format.space_after = _PT0  #段后间距=0
+            for run in paragraph.runs:
+                run.font.size = _PT22  # 字体大小2号
+                run.bold = False  # 加粗
+                run.font.name = '方正小标宋_GBK'  # 控制是西文时的字体
+                run.element.rPr.rFonts.set(_QN_EASTASIA, '方正小标宋_GBK')  # 控制是中文时的字体
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER # 居中
+        elif paragraphcnt == 2 and len(ptext) < 30:
+            # 作者单位、姓名
+            paragraph.paragraph_format.line_spacing = _PT28  # 行距固定值28磅
+            paragraph.paragraph_format.space_after = _PT0  # 段后间距=0
+            for run in paragraph.runs:
+                run.font.size = _PT16  # 字体大小2号
+                run.bold = False  # 加粗
+                run.font.name = '楷体'  # 控制是西文时的字体
+                run.element.rPr.rFonts.set(_QN_EASTASIA, '楷体')  # 控制是中文时的字体
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER  # 居中
+        elif paragraphcnt == 3 and len(ptext) < 30 and (ptext[0] == "（") and (ptext[1] in num):
+            # 日期，如（2023年6月15日）
+            paragraph.paragraph_format.line_spacing = _PT28  # 行距固定值28磅
+            paragraph.paragraph_format.space_after = _PT0  # 段后间距=0
+            for run in paragraph.runs:
+                run.font.size = _PT16  # 字体大小2号
+                run.bold = False  # 加粗
+                run.font.name = '楷体'  # 控制是西文时的字体
+                run.element.rPr.rFonts.set(_QN_EASTASIA, '楷体')  # 控制是中文时的字体
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER  # 居中
+        else:
+            # 序号不匹配头部格式时按正文处理
+            _format_body_paragraph(paragraph, docx)
+        if paragraphcnt >= 3:
+            break
+    # 正文阶段：剩余段落全部按正文处理
+    for paragraph in paragraphs:
+        ptext = _prepare_paragraph(paragraph)
+        dirty = True
+        if ptext is None:
+            continue
+        paragraphcnt = paragraphcnt +1
+        if DEBUG:
+            print('这是第%s段' %paragraphcnt)
+            print(ptext)
+        _format_body_paragraph(paragraph, docx)
+    if dirty:
+        setMargin(docx)
+    return dirty
+
+#处理单个文件：打开、排版、按需保存的I/O包装，各文件互相独立，可在进程池中并行执行
+def _process_file(file):
+    docx = Document(file)
+    if _format_document(docx):
+        docx.save(file)
+    return file
+
 def OneKeyWord():
-    global cn_num,num,punc,must
-    cn_num = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "十"]
-    num = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
-    punc = ["。", "，", "！", "？", "：", "；", "、", ".", "（", "）","．"]
-    must = ["要", "是", "能"]
-    filecnt = 0
     print('欢迎使用Word一键排版工具！创作者QQ：124500535')
     confirm= input("是否打开Ｗord文档？输入“Y”表示“打开”，输入“N”表示“取消”！")
     if confirm == 'Y' or confirm == 'y':
         a = QApplication([''])
         files, stylel = QFileDialog.getOpenFileNames(caption="多文件选择", directory="/", filter="Word 文档(*.docx)")
         print(files)  # 打印所选文件全部路径（包括文件名和后缀名）和文件类型
-        for file in files:
-            docx = Document(file)
-            paragraphcnt = 0
-            filecnt= filecnt+1
-            print('这是第%s个文件：%s' %(filecnt,file))
-            for paragraph in docx.paragraphs:
-                paragraphcnt = paragraphcnt +1
-                paragraph.text=paragraph.text.replace(",","，")
-                paragraph.text=paragraph.text.replace(";","；")
-                paragraph.text=paragraph.text.replace(":","：")
-                paragraph.text=paragraph.text.replace("!","！")
-                paragraph.text=paragraph.text.replace("?","？")
-                paragraph.text=paragraph.text.replace("(","（")
-                paragraph.text=paragraph.text.replace(")","）")
-                paragraph.text=paragraph.text.replace(" ","")
-                paragraph.text=paragraph.text.replace("\t", "")
-                paragraph.text = paragraph.text.replace("\n", "")
-                if paragraph.text == '':
-                    delete_paragraph(paragraph)
-                    paragraphcnt = paragraphcnt-1
-                    continue
-                paragraph.paragraph_format.left_indent = 0  #预先对缩进赋值, 防止对象为空报错
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:firstLineChars"), '0')  #并去除缩进
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:firstLine"), '0')
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:leftChars"), '0')
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:left"), '0')
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:rightChars"), '0')
-                paragraph.paragraph_format.element.pPr.ind.set(qn("w:right"), '0')
-                print('这是第%s段' %paragraphcnt)
-                print(paragraph.text)
-                if paragraphcnt == 1 and len(paragraph.text)<40:
-                    #处理头部空行
-                    #标题（方正小标宋_GBK、2号、加粗、居中、下端按2号字空一行）
-                    paragraph.paragraph_format.line_spacing=Pt(28)  #行距固定值28磅
-                    paragraph.paragraph_format.space_after = Pt(0)  #段后间距=0
-                    for run in paragraph.runs:
-                        run.font.size = Pt(22)  # 字体大小2号
-                        run.bold = False  # 加粗
-                        run.font.name = '方正小标宋_GBK'  # 控制是西文时的字体
-                        run.element.rPr.rFonts.set(qn('w:eastAsia'), '方正小标宋_GBK')  # 控制是中文时的字体
-                        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER # 居中
-                    continue
-                elif paragraphcnt == 2 and len(paragraph.text) < 30:
-                    # 作者单位、姓名
-                    paragraph.paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                    paragraph.paragraph_format.space_after = Pt(0)  # 段后间距=0
-                    for run in paragraph.runs:
-                        run.font.size = Pt(16)  # 字体大小2号
-                        run.bold = False  # 加粗
-                        run.font.name = '楷体'  # 控制是西文时的字体
-                        run.element.rPr.rFonts.set(qn('w:eastAsia'), '楷体')  # 控制是中文时的字体
-                        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER  # 居中
-                    continue
-                elif paragraphcnt == 3 and len(paragraph.text) < 30 and (paragraph.text[0] == "（") and (paragraph.text[1] in num):
-                    # 日期，如（2023年6月15日）
-                    paragraph.paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                    paragraph.paragraph_format.space_after = Pt(0)  # 段后间距=0
-                    for run in paragraph.runs:
-                        run.font.size = Pt(16)  # 字体大小2号
-                        run.bold = False  # 加粗
-                        run.font.name = '楷体'  # 控制是西文时的字体
-                        run.element.rPr.rFonts.set(qn('w:eastAsia'), '楷体')  # 控制是中文时的字体
-                        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER  # 居中
-                    continue
-                    # #处理正文
-                else:
-                    paragraph.paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                    paragraph.paragraph_format.space_after = Pt(0)  # 段后间距=0
-                    paragraph.paragraph_format.first_line_indent = Pt(32)
-                    for run in paragraph.runs:
-                        run.font.size = Pt(16)  # 字体大小3号
-                        run.bold = False  # 字体不加粗
-                        run.font.name = '仿宋_GB2312'
-                        run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                        if GradeOneTitle(run.text): #判断是否为一级标题格式（如：一、xxx）
-                            run.font.name = '黑体'
-                            run.element.rPr.rFonts.set(qn('w:eastAsia'), '黑体')
-                        elif GradeTwoTitle(run.text): #判断是否为二级标题格式（如：（一）xxx）
-                            if "。" not in run.text:
-                                run.font.name = '楷体'
-                                run.element.rPr.rFonts.set(qn('w:eastAsia'), '楷体')
-                            else:
-                                run.text = run.text.split('。',1)
-                                run.font.name = '楷体'
-                                run.element.rPr.rFonts.set(qn('w:eastAsia'), '楷体')
-                        elif GradeThreeTitle(run.text): #判断是否为三级标题格式（如：1.xxx）
-                            if "。" not in run.text:
-                                if (run.text[0] in num) and (run.text[1] in punc):
-                                    run.text = run.text.replace(run.text[1], "．",1)
-                                if (run.text[0] in num) and (run.text[1] in num) and (run.text[2] in punc):
-                                    run.text = run.text.replace(run.text[2], "．", 1)
-                                run.font.name = '仿宋_GB2312'
-                                run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                run.bold = True  # 字体加粗
-                            else:
-                                if (run.text[0] in num) and (run.text[1] in punc):
-                                    run.text = run.text.replace(run.text[1], "．", 1)
-                                if (run.text[0] in num) and (run.text[1] in num) and (run.text[2] in punc):
-                                    run.text = run.text.replace(run.text[2], "．", 1)
-                                sentence_to_bold = run.text.split('。')[0]+"。"
-                                sentence_not_to_bold = run.text.split('。',1)[1]
-                                paragraph.insert_paragraph_before(sentence_to_bold)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.first_line_indent = Pt(32)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.space_after = Pt(0)  # 段后间距=0
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[0].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                docx.paragraphs[paragraphcnt - 1].runs[0].bold = True  # 字体加粗
-                                docx.paragraphs[paragraphcnt - 1].add_run(sentence_not_to_bold).bold = False
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[1].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                delete_paragraph(paragraph)
-                        elif GradeFourTitle(run.text): #判断是否为四级标题格式（如：（1）xxx）
-                            if "。" not in run.text:
-                                run.font.name = '仿宋_GB2312'
-                                run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                run.bold = True  # 字体加粗
-                            else:
-                                sentence_to_bold = run.text.split('。')[0]+"。"
-                                sentence_not_to_bold = run.text.split('。',1)[1]
-                                paragraph.insert_paragraph_before(sentence_to_bold)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.first_line_indent = Pt(32)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.space_after = Pt(0)  # 段后间距=0
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[0].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                docx.paragraphs[paragraphcnt - 1].runs[0].bold = True  # 字体加粗
-                                docx.paragraphs[paragraphcnt - 1].add_run(sentence_not_to_bold).bold = False
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[1].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                delete_paragraph(paragraph)
-                        elif GradeFiveTitle(run.text): #判断是否为五级标题格式（如：一是xxx）
-                            if "。" not in run.text:                                
-                                run.font.name = '仿宋_GB2312'
-                                run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                run.bold = True  # 字体加粗
-                            else:                                
-                                sentence_to_bold = run.text.split('。')[0]+"。"
-                                sentence_not_to_bold = run.text.split('。',1)[1]
-                                paragraph.insert_paragraph_before(sentence_to_bold)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.first_line_indent = Pt(32)
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.line_spacing = Pt(28)  # 行距固定值28磅
-                                docx.paragraphs[paragraphcnt - 1].paragraph_format.space_after = Pt(0)  # 段后间距=0
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[0].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[0].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                docx.paragraphs[paragraphcnt - 1].runs[0].bold = True  # 字体加粗
-                                docx.paragraphs[paragraphcnt - 1].add_run(sentence_not_to_bold).bold = False
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.name = '仿宋_GB2312'
-                                docx.paragraphs[paragraphcnt - 1].runs[1].font.size = Pt(16)  # 字体大小3号
-                                docx.paragraphs[paragraphcnt - 1].runs[1].element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                                delete_paragraph(paragraph)
-                        elif LuoKuan(run.text):  # 判断是否为落款格式
-                            run.font.name = '仿宋_GB2312'
-                            run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-                            run.text = "\r" * 2 + run.text  # 前置空格，顶到最右，需手动调整空格
-                            paragraph.paragraph_format.left_indent = Pt(288)    #18B*16Pt=288Pt
-                        else: #普通正文格式
-                            run.font.name = '仿宋_GB2312'
-                            run.element.rPr.rFonts.set(qn('w:eastAsia'), '仿宋_GB2312')
-            setMargin(docx)
-            docx.save(file)
+        if not files:
+            return
+        # 各文件互不依赖，进程池并行处理；python-docx为纯Python计算不释放GIL，
+        # 用进程而非线程才能吃满多核
+        with ProcessPoolExecutor() as executor:
+            for filecnt, file in enumerate(executor.map(_process_file, files), 1):
+                print('已完成第%s个文件：%s' %(filecnt,file))
 if __name__ == '__main__':
     OneKeyWord()
     os.system("pause")
\ No newline at end of file
@@ -1,41 +1,71 @@
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
 
 doc = Document("tsinghua_template.docx")
 
+# 对齐方式 -> 中文名称，dict一次查找代替逐项if/elif比较
+_ALIGN_NAMES = {
+    WD_ALIGN_PARAGRAPH.LEFT: "左对齐",
+    WD_ALIGN_PARAGRAPH.CENTER: "居中",
+    WD_ALIGN_PARAGRAPH.RIGHT: "右对齐",
+}
+
+# 字体属性的限定名，模块级算一次
+_QN_RFONTS = qn('w:rFonts')
+_QN_ASCII = qn('w:ascii')
+_QN_B = qn('w:b')
+_QN_I = qn('w:i')
+_QN_SZ = qn('w:sz')
+_QN_VAL = qn('w:val')
+
+
+# 开关型元素（w:b/w:i）求值：缺省时存在即为真，val为0/false/off时为假
+def _on(elem):
+    return elem is not None and elem.get(_QN_VAL) not in ('0', 'false', 'off')
+
+
+# 汇总单个run的字体信息：rPr只取一次，直接读其子元素，
+# 免去run.font.name/bold/italic/size四次各自穿透XML的描述符访问
+def _summarize_run(run, parts):
+    parts.append(f"  文本块: {run.text}\n")
+    rPr = run._r.rPr
+
+    # 字体名称
+    rFonts = rPr.find(_QN_RFONTS) if rPr is not None else None
+    font_name = rFonts.get(_QN_ASCII) if rFonts is not None else None
+    if not font_name:  # 如果未显式设置，可能继承样式
+        font_name = "默认字体"
+    parts.append(f"    字体: {font_name}\n")
+
+    # 加粗/斜体
+    if rPr is not None:
+        bold = "是" if _on(rPr.find(_QN_B)) else "否"
+        italic = "是" if _on(rPr.find(_QN_I)) else "否"
+    else:
+        bold = italic = "否"
+    parts.append(f"    加粗: {bold}, 斜体: {italic}\n")
+
+    # 字号（半磅值转换为磅值）
+    sz = rPr.find(_QN_SZ) if rPr is not None else None
+    if sz is not None:
+        parts.append(f"    字号: {int(sz.get(_QN_VAL)) / 2} 磅\n")
+    else:
+        parts.append("    字号: 默认\n")
+
+
+# 输出先累积到列表，结尾一次join写盘，免去每字段一次write调用
+parts = []
+for para in doc.paragraphs:
+    parts.append(f"\n段落: {para.text[:30]}...")  # 写入前30个字符
+
+    # 段落对齐方式
+    align_name = _ALIGN_NAMES.get(para.paragraph_format.alignment, "未知")
+    parts.append(f"对齐方式: {align_name}\n")
+
+    # 遍历段落中的运行（Run）
+    for run in para.runs:
+        _summarize_run(run, parts)
+
 with open("template_format.txt", "w", encoding="utf-8") as file:
-    for para in doc.paragraphs:
-        file.write(f"\n段落: {para.text[:30]}...")  # 写入前30个字符
-        
-        # 段落对齐方式
-        alignment = para.paragraph_format.alignment
-        align_name = "未知"
-        if alignment == WD_ALIGN_PARAGRAPH.LEFT:
-            align_name = "左对齐"
-        elif alignment == WD_ALIGN_PARAGRAPH.CENTER:
-            align_name = "居中"
-        elif alignment == WD_ALIGN_PARAGRAPH.RIGHT:
-            align_name = "右对齐"
-        file.write(f"对齐方式: {align_name}\n")
-
-        # 遍历段落中的运行（Run）
-        for run in para.runs:
-            file.write(f"  文本块: {run.text}\n")
-            font = run.font
-            
-            # 字体名称
-            font_name = font.name
-            if not font_name:  # 如果未显式设置，可能继承样式
-                font_name = "默认字体"
-            file.write(f"    字体: {font_name}\n")
-            
-            # 加粗/斜体
-            bold = "是" if font.bold else "否"
-            italic = "是" if font.italic else "否"
-            file.write(f"    加粗: {bold}, 斜体: {italic}\n")
-            
-            # 字号（转换为磅值）
-            if font.size:
-                file.write(f"    字号: {font.size.pt} 磅\n")
-            else:
-                file.write("    字号: 默认\n")
\ No newline at end of file
+    file.write("".join(parts))